@@ -1,6 +1,9 @@
+import numpy as np
+
 from components.color import RGBA
 from components.font import FontSettings
 from components.polygons import Mesh, Triangle, Quad
+from shared_dcs import OverlayLine
 
 
 from typing import Callable
@@ -63,6 +66,17 @@ class GraphicsABC(ABC):
     ) -> None:
         pass
 
+    @abstractmethod
+    def draw_circles(
+        self,
+        points: np.ndarray,
+        radii: np.ndarray,
+        color: RGBA,
+    ) -> None:
+        """Draws many circles of one color in one call. `points` are (N, 2)
+        screen points and `radii` (N,) radii in pixels."""
+        pass
+
     @abstractmethod
     def draw_line(
         self,
@@ -81,6 +95,19 @@ class GraphicsABC(ABC):
     def draw_triangle(self, triangle: Triangle, mesh_lines: bool = False) -> None:
         pass
 
+    @abstractmethod
+    def draw_triangles(
+        self,
+        vertices: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray,
+        mesh_lines: bool = False,
+    ) -> None:
+        """Draws many triangles in one call. `vertices` are (V, 2) or (V, 3)
+        screen points, `indices` (T, 3) rows into them and `colors` (T, 3)
+        final uint8 RGB face colors, used as they are."""
+        pass
+
     @abstractmethod
     def draw_quad(self, quad: Quad, mesh_lines: bool = False):
         pass
@@ -91,6 +118,11 @@ class GraphicsABC(ABC):
     ) -> None:
         pass
 
+    @abstractmethod
+    def draw_overlay(self, lines: list[OverlayLine]) -> None:
+        "Draws the complete set of overlay text lines for this frame."
+        pass
+
     @abstractmethod
     def clear_screen(self) -> None:
         pass
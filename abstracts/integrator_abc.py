@@ -0,0 +1,26 @@
+import numpy as np
+
+from typing import Callable
+from abc import ABC, abstractmethod
+
+# Maps an (N, 3) position array to the (N, 3) accelerations at those positions.
+AccelerationFunction = Callable[[np.ndarray], np.ndarray]
+
+
+class IntegratorABC(ABC):
+    name: str
+
+    @abstractmethod
+    def step(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        "Advances all bodies by one timestep, returns new positions and velocities."
+        pass
+
+    def reset(self) -> None:
+        "Drops any state carried between steps."
+        pass
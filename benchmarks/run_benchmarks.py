@@ -0,0 +1,255 @@
+"""Headless benchmarks for the render and physics pipeline.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --output benchmark_results.json
+
+Every scene is rendered at each of its sizes with the frame profiler
+enabled, and the per-stage timings are written as JSON so runs can be
+compared across commits. With `--workers 0 1 2 4` every run is repeated
+for each mesh pipeline worker count (0 runs the stages serially) and the
+speedup over the first count is reported."""
+
+import os
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+import numpy as np
+import pygame as pyg
+
+from components.graphics import PygHeadlessGraphics
+from components.camera import Camera
+from components.draw_call import DrawCall
+from components.profiler import FrameProfiler
+from components.simulation import Simulation
+from benchmarks.scenes import SCENES
+
+from pathlib import Path
+from typing import Optional
+
+# Scenes whose physics is stepped every frame, the others only render.
+PHYSICS_SCENES = ("nbody", "particles")
+
+
+def get_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def get_metadata(arguments: argparse.Namespace) -> dict:
+    metadata = {
+        "commit": get_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "pygame": pyg.version.ver,
+        "width": arguments.width,
+        "height": arguments.height,
+        "frames": arguments.frames,
+        "warmup": arguments.warmup,
+        "workers": arguments.workers,
+        "cpu_count": os.cpu_count(),
+    }
+    return metadata
+
+
+def get_stage_statistics(profiler: FrameProfiler) -> dict[str, dict[str, float]]:
+    statistics = {}
+    for name, samples in profiler.samples.items():
+        samples_ms = np.array(samples) * 1000.0
+        statistics[name] = {
+            "mean_ms": float(samples_ms.mean()),
+            "p50_ms": float(np.percentile(samples_ms, 50)),
+            "p95_ms": float(np.percentile(samples_ms, 95)),
+            "min_ms": float(samples_ms.min()),
+        }
+    return statistics
+
+
+def run_frame(
+    profiler: FrameProfiler,
+    graphics: PygHeadlessGraphics,
+    draw_call: DrawCall,
+    simulation: Simulation,
+    timestep: Optional[float],
+) -> None:
+    frame_start = time.perf_counter()
+
+    if timestep:
+        with profiler.stage("physics"):
+            simulation.step_physics(timestep)
+
+    with profiler.stage("clear_screen"):
+        graphics.clear_screen()
+    with profiler.stage("draw"):
+        draw_call.draw()
+    with profiler.stage("present"):
+        graphics.update()
+
+    profiler.record("frame", time.perf_counter() - frame_start)
+    profiler.tick()
+
+
+def run_scene(
+    graphics: PygHeadlessGraphics,
+    scene_name: str,
+    size: int,
+    workers: int,
+    arguments: argparse.Namespace,
+) -> dict:
+    get_bodies, _ = SCENES[scene_name]
+    width, height = graphics.get_screensize()
+
+    build_start = time.perf_counter()
+    bodies = get_bodies(size)
+    build_time = time.perf_counter() - build_start
+
+    camera = Camera(width, height)
+    profiler = FrameProfiler(sample_count=arguments.frames, report_interval=1)
+    draw_call = DrawCall(graphics, camera, profiler)
+    draw_call.set_mesh_workers(workers)
+    for body in bodies:
+        draw_call.add_object(body)
+
+    simulation = Simulation(draw_call)
+    simulation.enable_gravity = True
+    timestep = 1.0 / 60.0 if scene_name in PHYSICS_SCENES else None
+
+    for _ in range(arguments.warmup):
+        run_frame(profiler, graphics, draw_call, simulation, timestep)
+
+    profiler.enabled = True
+    for _ in range(arguments.frames):
+        run_frame(profiler, graphics, draw_call, simulation, timestep)
+
+    draw_call.set_mesh_workers(0)
+    objects = draw_call.objects
+    polygon_count = sum(b.physics.mesh.get_polygon_count() for b in objects)
+    result = {
+        "scene": scene_name,
+        "size": size,
+        "workers": workers,
+        "bodies": len(bodies),
+        "polygons": polygon_count,
+        "particles": draw_call.get_particle_count(),
+        "build_ms": build_time * 1000.0,
+        "stages": get_stage_statistics(profiler),
+    }
+    return result
+
+
+def print_result(result: dict) -> None:
+    frame = result["stages"]["frame"]
+    scene = f"{result['scene']}[{result['size']}]"
+    polygons = result["polygons"]
+    workers = result["workers"]
+    mean = frame["mean_ms"]
+    p95 = frame["p95_ms"]
+    print(
+        f"{scene:<16} {polygons:>8} polys  {workers:>2} workers"
+        f"  {mean:>9.2f} ms  p95 {p95:>9.2f} ms"
+    )
+
+
+def get_scaling(results: list[dict]) -> list[dict]:
+    "Speedup of every worker count over the first one run for the same scene."
+    baselines = {}
+    scaling = []
+    for result in results:
+        key = (result["scene"], result["size"])
+        mean = result["stages"]["frame"]["mean_ms"]
+        baseline = baselines.setdefault(key, (result["workers"], mean))
+
+        entry = {
+            "scene": result["scene"],
+            "size": result["size"],
+            "workers": result["workers"],
+            "baseline_workers": baseline[0],
+            "speedup": baseline[1] / mean if mean else 0.0,
+        }
+        scaling.append(entry)
+    return scaling
+
+
+def print_scaling(scaling: list[dict]) -> None:
+    print("SCALING (frame mean, relative to the first worker count)")
+    for entry in scaling:
+        scene = f"{entry['scene']}[{entry['size']}]"
+        workers = entry["workers"]
+        speedup = entry["speedup"]
+        print(f"{scene:<16} {workers:>2} workers  {speedup:>6.2f}x")
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render and physics benchmarks")
+    parser.add_argument(
+        "--scenes",
+        nargs="+",
+        choices=list(SCENES),
+        default=list(SCENES),
+        help="scenes to run, all by default",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=None,
+        help="override the canonical sizes of every selected scene",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        default=[0],
+        help="mesh pipeline worker counts to compare, 0 runs the stages serially",
+    )
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--width", type=int, default=1760)
+    parser.add_argument("--height", type=int, default=960)
+    parser.add_argument("--output", type=Path, default=Path("./benchmark_results.json"))
+    return parser.parse_args()
+
+
+def main() -> None:
+    arguments = parse_arguments()
+    graphics = PygHeadlessGraphics(arguments.width, arguments.height)
+
+    results = []
+    for scene_name in arguments.scenes:
+        _, sizes = SCENES[scene_name]
+        for size in arguments.sizes or sizes:
+            for workers in arguments.workers:
+                result = run_scene(graphics, scene_name, size, workers, arguments)
+                print_result(result)
+                results.append(result)
+
+    scaling = get_scaling(results)
+    if len(arguments.workers) > 1:
+        print_scaling(scaling)
+
+    report = {
+        "metadata": get_metadata(arguments),
+        "results": results,
+        "scaling": scaling,
+    }
+    with open(arguments.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"RESULTS WRITTEN: {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
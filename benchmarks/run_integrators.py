@@ -0,0 +1,83 @@
+"""Energy drift and cost of the body integrators.
+
+Run from the repository root:
+
+    python -m benchmarks.run_integrators --bodies 50 --steps 2000
+
+A seeded cloud of bodies is stepped with every integrator at each
+timestep, using the same softened gravity as the simulation, and the
+relative drift of the total energy after the run is reported."""
+
+import time
+import argparse
+
+import numpy as np
+
+from components.gravity import DirectGravity
+from components.integrators import INTEGRATORS, get_integrator
+
+
+def get_cloud(count: int, seed: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    "Bodies in a sphere, rotating slowly around the z axis."
+    generator = np.random.default_rng(seed)
+    positions = generator.uniform(-500.0, 500.0, (count, 3))
+    velocities = np.stack((-positions[:, 1], positions[:, 0], np.zeros(count)), 1)
+    velocities *= 0.02
+    masses = generator.uniform(1e4, 1e5, count)
+    return positions, velocities, masses
+
+
+def get_energy(
+    gravity: DirectGravity,
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    masses: np.ndarray,
+) -> float:
+    kinetic = 0.5 * float(np.sum(masses * np.sum(velocities**2, axis=1)))
+    return kinetic + gravity.get_potential_energy(positions, masses)
+
+
+def run_integrator(
+    name: str, timestep: float, steps: int, arguments: argparse.Namespace
+) -> dict:
+    gravity = DirectGravity(softening=10.0)
+    positions, velocities, masses = get_cloud(arguments.bodies, arguments.seed)
+    integrator = get_integrator(name)
+
+    def get_accelerations(positions: np.ndarray) -> np.ndarray:
+        return gravity.get_accelerations(positions, masses)
+
+    initial_energy = get_energy(gravity, positions, velocities, masses)
+    start = time.perf_counter()
+    for _ in range(steps):
+        positions, velocities = integrator.step(
+            positions, velocities, timestep, get_accelerations
+        )
+    elapsed = time.perf_counter() - start
+
+    energy = get_energy(gravity, positions, velocities, masses)
+    drift = (energy - initial_energy) / abs(initial_energy)
+    return {"drift": drift, "ms_per_step": elapsed / steps * 1000.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--integrators", nargs="+", default=list(INTEGRATORS))
+    parser.add_argument("--timesteps", nargs="+", type=float, default=[0.01, 0.05])
+    parser.add_argument("--bodies", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    for timestep in arguments.timesteps:
+        for name in arguments.integrators:
+            result = run_integrator(name, timestep, arguments.steps, arguments)
+            print(
+                f"{name:>9}  dt {timestep:<6}  "
+                f"drift {result['drift']:+.2e}  "
+                f"{result['ms_per_step']:.3f} ms/step"
+            )
+
+
+if __name__ == "__main__":
+    main()
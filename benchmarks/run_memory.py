@@ -0,0 +1,109 @@
+"""Memory and allocation cost of the core polygon and color types.
+
+Run from the repository root:
+
+    python -m benchmarks.run_memory --polygons 20000
+
+Reports the bytes and allocations per polygon (Triangle with its
+vertices, shader and color wrapped in a Polygon) and per RGBA, and the
+time of the per-frame operations that create these objects: building the world polygons of an instanced mesh and
+averaging a new shader into every triangle."""
+
+import gc
+import time
+import argparse
+import tracemalloc
+
+from components.color import RGBA
+from components.vectors import Vector3D
+from components.polygons import InstancedMesh, Mesh, Polygon, Triangle
+
+from typing import Callable
+
+
+def make_polygons(count: int) -> list[Polygon]:
+    polygons = []
+    for index in range(count):
+        x = float(index)
+        vertices = (
+            Vector3D(x, 0.0, 0.0),
+            Vector3D(x, 1.0, 0.0),
+            Vector3D(x, 0.0, 1.0),
+        )
+        face = (3 * index, 3 * index + 1, 3 * index + 2)
+        shader = RGBA(0.5, 0.5, 0.5, 1.0)
+        color = RGBA(1.0, 1.0, 1.0, 1.0)
+        polygons.append(Polygon(Triangle(vertices, face, shader, color)))
+    return polygons
+
+
+def make_colors(count: int) -> list[RGBA]:
+    return [RGBA(0.5, 0.5, float(index), 1.0) for index in range(count)]
+
+
+def get_allocated(
+    make_objects: Callable[[int], list], count: int
+) -> tuple[float, float]:
+    "Bytes and allocated blocks per object while building `count` objects."
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = make_objects(count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    statistics = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in statistics)
+    blocks = sum(stat.count_diff for stat in statistics)
+    del objects
+    return size / count, blocks / count
+
+
+def time_operation(function, repeats: int) -> float:
+    "Best time of `repeats` runs in milliseconds."
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polygons", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=5)
+    arguments = parser.parse_args()
+    count = arguments.polygons
+
+    polygon_size, polygon_blocks = get_allocated(make_polygons, count)
+    color_size, color_blocks = get_allocated(make_colors, count)
+    print(f"polygon    {polygon_size:.1f} bytes  {polygon_blocks:.1f} allocations")
+    print(f"rgba       {color_size:.1f} bytes  {color_blocks:.1f} allocations")
+
+    polygons = make_polygons(count)
+
+    mesh = InstancedMesh(Mesh(polygons), Vector3D(10.0, 0.0, 0.0))
+    build = time_operation(lambda: mesh.get_world_polygons(), arguments.repeats)
+    print(f"world      {build:.2f} ms for {count} instanced polygons")
+
+    light_shader = RGBA(0.9, 0.8, 0.7, 1.0)
+
+    def average_shaders():
+        for polygon in polygons:
+            triangle = polygon.shape
+            triangle.shader = triangle.shader.average(light_shader)
+
+    average = time_operation(average_shaders, arguments.repeats)
+    print(f"average    {average:.2f} ms for {count} shader updates")
+
+    def construct_colors():
+        for index in range(count):
+            RGBA(0.5, 0.5, 0.5, 1.0)
+
+    construct = time_operation(construct_colors, arguments.repeats)
+    print(f"construct  {construct:.2f} ms for {count} RGBA")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import math
+import random
+
+from components.shape import Shape
+from components.light import Light
+from components.vectors import Vector3D
+from components.vertices import Sphere, Cube, GridHorizontal, MeshConverter
+from components.vertices import ParticleCircle
+from components.particles import ParticleSystem
+from components.assets import asset_registry
+
+from pathlib import Path
+from typing import Callable, Union
+
+
+def get_cottage_scene(size: int) -> list[Shape]:
+    "Places `size` instances of the cottage OBJ along the z axis."
+    file_path = Path("./cottage2.obj")
+    bodies = []
+
+    for idx in range(size):
+        position = (500.0, -100.0, 600.0 - idx * 800.0)
+        mesh = asset_registry.get_obj_instance(file_path, 0.2, position)
+        bodies.append(Shape(mesh))
+    return bodies
+
+
+def get_spheres_scene(size: int) -> list[Shape]:
+    "Places `size` lit spheres on a square lattice around the origin."
+    bodies = []
+    columns = math.ceil(math.sqrt(size))
+    spacing = 300.0
+
+    for idx in range(size):
+        row, column = divmod(idx, columns)
+        position = (row * spacing, 0.0, (column - columns / 2.0) * spacing)
+
+        sphere = Sphere(100, 10, 10)
+        sphere.set_offset(*position)
+        mesh = sphere.get_triangle_mesh()
+        mesh.light = Light.get_light()
+
+        body = Shape(mesh)
+        body.physics.set_position(*position)
+        bodies.append(body)
+    return bodies
+
+
+def get_grid_scene(size: int) -> list[Shape]:
+    "A single `size` x `size` horizontal grid centered below the origin."
+    cell_size = 3000.0 / size
+    grid = GridHorizontal(size, size, cell_size)
+    grid.set_offset(-1500.0, -100.0, -1500.0)
+    mesh = grid.get_triangle_polygons()
+    return [Shape(mesh)]
+
+
+def get_nbody_scene(size: int) -> list[Shape]:
+    "A seeded cloud of `size` small cubes with random positions and masses."
+    rng = random.Random(size)
+    bodies = []
+
+    for _ in range(size):
+        position = (
+            rng.uniform(-1000.0, 1000.0),
+            rng.uniform(-500.0, 500.0),
+            rng.uniform(-1000.0, 1000.0),
+        )
+        mesh = Cube(20).get_polygons()
+        mesh = MeshConverter(mesh).quads_to_triangles()
+        mesh.translate(Vector3D(*position))
+
+        body = Shape(mesh)
+        body.physics.set_position(*position)
+        body.physics.set_mass(rng.uniform(1_000.0, 100_000.0))
+        bodies.append(body)
+    return bodies
+
+
+def get_particles_scene(size: int) -> list[ParticleSystem]:
+    "A rotating particle disk seeded from a ParticleCircle of radius `size`."
+    particle_circle = ParticleCircle(size)
+    particles = ParticleSystem.from_particle_circle(particle_circle, 0.0, 0.0, 0.0)
+    particles.set_orbital_velocity((0.0, 0.0, 0.0), 100.0)
+    return [particles]
+
+
+SceneBuilder = Callable[[int], list[Union[Shape, ParticleSystem]]]
+
+SCENES: dict[str, tuple[SceneBuilder, tuple[int, ...]]] = {
+    "cottage": (get_cottage_scene, (1, 4)),
+    "spheres": (get_spheres_scene, (1, 8, 32)),
+    "grid": (get_grid_scene, (10, 30, 60)),
+    "nbody": (get_nbody_scene, (10, 50, 100)),
+    "particles": (get_particles_scene, (100, 300, 1000)),
+}
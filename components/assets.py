@@ -0,0 +1,44 @@
+from components.polygons import Mesh, InstancedMesh
+from components.model import OBJModelFormat
+from components.vectors import Vector3D
+from components.color import RGBA
+from components.lod import LODGenerator
+
+from pathlib import Path
+from typing import Optional
+
+
+class AssetRegistry:
+    """Loads each mesh asset once and hands out instances of it.
+
+    Assets are kept in local space, every instance carries its own
+    offset and color while sharing the asset geometry."""
+
+    def __init__(self):
+        self.meshes: dict[tuple[Path, float], Mesh] = {}
+        self.lod_generator = LODGenerator()
+
+    def get_obj_mesh(self, file_path: Path, scale: float = 1.0) -> Mesh:
+        key = (file_path.resolve(), scale)
+        if key not in self.meshes:
+            obj = OBJModelFormat(file_path, scale)
+            mesh = obj.get_polygons()
+            self.meshes[key] = self.lod_generator.generate(mesh)
+        return self.meshes[key]
+
+    def get_obj_instance(
+        self,
+        file_path: Path,
+        scale: float,
+        position: tuple[float, float, float],
+        color: Optional[RGBA] = None,
+    ) -> InstancedMesh:
+        asset = self.get_obj_mesh(file_path, scale)
+        offset = Vector3D(*position)
+        return InstancedMesh(asset, offset, color)
+
+    def get_asset_count(self) -> int:
+        return len(self.meshes)
+
+
+asset_registry = AssetRegistry()
@@ -81,7 +81,7 @@ class Camera:
         return vo
 
     def apply_projection_polygons(self, mesh: Mesh) -> Mesh:
-        mesh = deepcopy(mesh)
+        mesh = Mesh(deepcopy(mesh.polygons), mesh.light)
         self.apply_direction_adjustment()
 
         for polygon in mesh.polygons:
@@ -164,9 +164,9 @@ class Camera:
     def apply_direction_adjustment(self):
         self.look_direction = self.camera_target.subtract_vector(self.camera_position)
         self.look_direction = self.look_direction.normalize()
-        self.side_direction = self.look_direction.cross_product(self.up_direction)
-        self.side_direction = self.side_direction.normalize()
 
+        # The side axis is built from the up axis of the current yaw and
+        # pitch, so the axes are settled after a single call.
         yaw_rad = math.radians(self.yaw)
         pitch_rad = math.radians(self.pitch - 90.0)
         up_x = math.cos(yaw_rad) * math.cos(pitch_rad)
@@ -174,6 +174,9 @@ class Camera:
         up_z = math.sin(yaw_rad) * math.cos(pitch_rad)
         self.up_direction = Vector3D(up_x, up_y, up_z).normalize()
 
+        self.side_direction = self.look_direction.cross_product(self.up_direction)
+        self.side_direction = self.side_direction.normalize()
+
     def apply_mouse_movement(self):
         yaw_rad = math.radians(self.yaw)
         pitch_rad = math.radians(self.pitch)
@@ -212,6 +215,7 @@ class Camera:
             far_plane += increment
             self.frustum.near_plane = clamp_float(near_plane, 0.1, float("inf"))
             self.frustum.far_plane = clamp_float(far_plane, near_plane, float("inf"))
+            self.frustum.planes = self.frustum.make_frustum()
 
     def increment_target_x(self, increment: float):
         self.camera_target.x += increment
@@ -0,0 +1,124 @@
+import os
+import queue
+import threading
+import multiprocessing
+
+from pathlib import Path
+from typing import Optional, Union
+
+CAPTURE_FORMATS = ("png", "raw")
+CAPTURE_POLICIES = ("drop", "block")
+CAPTURE_WRITERS = ("thread", "process")
+
+Frame = Optional[tuple[int, bytes]]
+
+
+def write_frames(
+    frames: Union[queue.Queue, multiprocessing.Queue],
+    directory: str,
+    image_format: str,
+    size: tuple[int, int],
+) -> None:
+    """Writes queued (index, RGB bytes) frames until a None arrives. PNG
+    frames are numbered files, raw frames are appended to frames.rgb."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame as pyg
+
+    raw_file = None
+    if image_format == "raw":
+        raw_file = open(Path(directory) / "frames.rgb", "wb")
+
+    try:
+        while (frame := frames.get()) is not None:
+            index, data = frame
+            if raw_file:
+                raw_file.write(data)
+            else:
+                image = pyg.image.frombytes(data, size, "RGB")
+                pyg.image.save(image, str(Path(directory) / f"frame_{index:06d}.png"))
+    finally:
+        if raw_file:
+            raw_file.close()
+
+
+class FrameCapture:
+    """Records rendered frames without encoding them on the render thread.
+
+    The render loop only copies the framebuffer into a bounded queue, a
+    writer thread or process saves the frames. When the queue is full the
+    "drop" policy skips the frame and counts it, "block" waits for the
+    writer. PNG encoding holds the GIL, a writer process keeps it off the
+    render thread, raw output is cheap enough for a thread."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        size: tuple[int, int],
+        image_format: str = "png",
+        policy: str = "drop",
+        writer: str = "process",
+        max_queued: int = 8,
+    ):
+        if image_format not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format '{image_format}'.")
+        if policy not in CAPTURE_POLICIES:
+            raise ValueError(f"Unknown capture policy '{policy}'.")
+        if writer not in CAPTURE_WRITERS:
+            raise ValueError(f"Unknown capture writer '{writer}'.")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.size = size
+        self.image_format = image_format
+        self.policy = policy
+        self.enabled = True
+        self.frame_index = 0
+        self.captured = 0
+        self.dropped = 0
+
+        arguments = (str(self.directory), image_format, size)
+        if writer == "process":
+            context = multiprocessing.get_context("spawn")
+            self.frames = context.Queue(maxsize=max_queued)
+            self.writer = context.Process(
+                target=write_frames, args=(self.frames, *arguments), daemon=True
+            )
+        else:
+            self.frames = queue.Queue(maxsize=max_queued)
+            self.writer = threading.Thread(
+                target=write_frames, args=(self.frames, *arguments), daemon=True
+            )
+        self.writer.start()
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        print("CAPTURE:", self.enabled)
+
+    def capture(self, data: bytes) -> None:
+        "Queues the RGB bytes of a frame of `size`."
+        if not self.enabled:
+            return
+
+        frame = (self.frame_index, data)
+        self.frame_index += 1
+        if self.policy == "block":
+            self.frames.put(frame)
+        else:
+            try:
+                self.frames.put_nowait(frame)
+            except queue.Full:
+                self.dropped += 1
+                return
+        self.captured += 1
+
+    def close(self) -> None:
+        "Writes the queued frames and stops the writer."
+        self.frames.put(None)
+        self.writer.join()
+        print(f"CAPTURED: {self.captured}  DROPPED: {self.dropped}  ({self.directory})")
+        if self.image_format == "raw":
+            width, height = self.size
+            print(
+                f"RAW VIDEO: rgb24 {width}x{height}, e.g. ffmpeg -f rawvideo "
+                f"-pix_fmt rgb24 -s {width}x{height} -i frames.rgb out.mp4"
+            )
@@ -1,10 +1,13 @@
 from components.vectors import Vector3D
 
-from dataclasses import dataclass
+from typing import NamedTuple
 
 
-@dataclass(frozen=True)
-class RGBA:
+class RGBA(NamedTuple):
+    """Immutable color, a tuple subclass so instances have no __dict__ and
+    are built without the per-field object.__setattr__ of a frozen dataclass.
+    Shared colors are interned as the module constants below."""
+
     red: float
     green: float
     blue: float
@@ -12,7 +15,7 @@ class RGBA:
 
     @property
     def rgb_tuple(self) -> tuple[float, float, float]:
-        return (self.red, self.green, self.blue)
+        return self[:3]
 
     @property
     def rgb_tuple_u8(self) -> tuple[int, int, int]:
@@ -23,28 +26,28 @@ class RGBA:
 
     @property
     def rgba_tuple(self) -> tuple[float, float, float, float]:
-        return (self.red, self.green, self.blue, self.alpha)
+        return tuple(self)
 
     @classmethod
     def from_rgb(cls, red: float, green: float, blue: float) -> "RGBA":
-        """Create the RGBA dataclass from RGB parameters
+        """Create the RGBA color from RGB parameters
         with the alpha channel set to 1.0."""
         return RGBA(red, green, blue, 1.0)
 
     @classmethod
     def from_vector(cls, vector: Vector3D):
-        """Create the RGBA dataclass from a Vector3D object
+        """Create the RGBA color from a Vector3D object
         with the alpha channel set to 1.0."""
         return RGBA(vector.x, vector.y, vector.z, 1.0)
 
     @classmethod
     def from_rgba_tuple(cls, rgba: tuple[float, float, float, float]) -> "RGBA":
-        "Create the RGBA dataclass from an (R, G, B, A) tuple."
+        "Create the RGBA color from an (R, G, B, A) tuple."
         return RGBA(rgba[0], rgba[1], rgba[2], rgba[3])
 
     @classmethod
     def from_rgb_tuple(cls, rgb: tuple[float, float, float]) -> "RGBA":
-        """Create the RGBA dataclass from an (R, G, B) tuple
+        """Create the RGBA color from an (R, G, B) tuple
         with the alpha channel set to 1.0."""
         return RGBA(rgb[0], rgb[1], rgb[2], 1.0)
 
@@ -65,6 +68,11 @@ class RGBA:
     def clamp(self, min_value: float, max_value: float) -> "RGBA":
         red = max(min_value, min(self.red, max_value))
         green = max(min_value, min(self.green, max_value))
-        blue = max(min_value, min(self.red, max_value))
-        alpha = max(min_value, min(self.red, max_value))
+        blue = max(min_value, min(self.blue, max_value))
+        alpha = max(min_value, min(self.alpha, max_value))
         return RGBA(red, green, blue, alpha)
+
+
+WHITE = RGBA(1.0, 1.0, 1.0, 1.0)
+UNLIT = RGBA(0.0, 0.0, 0.0, 0.0)
+MESH_LINE_SHADER = RGBA(0.8, 0.8, 0.8, 1.0)
@@ -5,25 +5,81 @@ from components.polygons import Mesh
 
 from components.z_buffer import ZBufferSort2
 from components.backface_culling import BackfaceCulling
+from components.lod import LODSelector
+from components.profiler import FrameProfiler
+from components.mesh_pipeline import (
+    MeshPipelinePool,
+    PipelineView,
+    PipelineMaterial,
+    get_triangle_arrays,
+)
+from components.particles import ParticleSystem
+from components.vectors import Vector3D
+from components.quality import QUALITY_LEVELS
+from shared_dcs import PhysicsSnapshot, QualityLevel
 
 from components.shaders import Shaders
 from components.light import Light
 from components.debug import console_overwrite
-from copy import copy
+
+from typing import Optional
 
 
 class DrawCall:
-    def __init__(self, graphics: GraphicsABC, camera: Camera):
+    def __init__(
+        self,
+        graphics: GraphicsABC,
+        camera: Camera,
+        profiler: Optional[FrameProfiler] = None,
+    ):
         self.objects: list[Body] = []
+        self.particle_systems: list[ParticleSystem] = []
         self.graphics = graphics
         self.camera = camera
         self.shaders = Shaders()
         self.z_buffer_sort = ZBufferSort2()
         self.backface_culling = BackfaceCulling()
+        self.lod_selector = LODSelector()
+        self.profiler = profiler if profiler else FrameProfiler()
+        self.interpolation_alpha = 1.0
+        self.physics_snapshot: Optional[PhysicsSnapshot] = None
+        self.mesh_pipeline: Optional[MeshPipelinePool] = None
         self.meshes = []
+        self.quality = QUALITY_LEVELS[0]
+        self.frame_index = 0
 
     def add_object(self, object: Body) -> None:
-        self.objects.append(object)
+        if isinstance(object, ParticleSystem):
+            self.particle_systems.append(object)
+        else:
+            self.objects.append(object)
+
+    def get_particle_count(self) -> int:
+        return sum(len(system) for system in self.particle_systems)
+
+    def set_mesh_workers(self, workers: int) -> None:
+        "Runs the per-mesh stages on a pool of processes, 0 runs them serially."
+        if self.mesh_pipeline:
+            self.mesh_pipeline.close()
+            self.mesh_pipeline = None
+
+        if workers > 0:
+            self.mesh_pipeline = MeshPipelinePool(workers)
+
+    def set_quality(self, quality: QualityLevel) -> None:
+        self.quality = quality
+
+    def apply_quality(self) -> None:
+        "Applies the quality level, again after a camera reset replaced the frustum."
+        quality = self.quality
+        self.lod_selector.max_error_px = quality.max_error_px
+        frustum = self.camera.frustum
+        if frustum.far_plane_limit != quality.far_plane:
+            frustum.set_far_plane_limit(quality.far_plane)
+
+    def is_lighting_frame(self) -> bool:
+        "Lower shading quality relights the meshes only every few frames."
+        return self.frame_index % self.quality.lighting_interval == 0
 
     def get_camera_light(self):
         camera_position = self.camera.camera_position
@@ -41,11 +97,32 @@ class DrawCall:
         # lights.append(camera_light)
         return lights
 
+    def get_lod_level(self, mesh: Mesh) -> int:
+        camera_position = self.camera.camera_position
+        fov = self.camera.frustum.fov
+        height = self.camera.frustum.height
+        level = self.lod_selector.select_level(mesh, camera_position, fov, height)
+        return level
+
+    def get_render_positions(self) -> list[Vector3D]:
+        if self.physics_snapshot:
+            return self.physics_snapshot.get_render_positions()
+
+        alpha = self.interpolation_alpha
+        positions = []
+        for body in self.objects:
+            position = body.physics.get_interpolated_position(alpha)
+            positions.append(position)
+        return positions
+
     def get_meshes(self) -> list[Mesh]:
         meshes = []
-        for body in self.objects:
+        render_positions = self.get_render_positions()
+        for body, render_position in zip(self.objects, render_positions):
+            body.physics.move_mesh(render_position)
             mesh = body.physics.mesh
-            mesh.polygons = copy(mesh.original_polygons)
+            level = self.get_lod_level(mesh)
+            mesh.polygons = mesh.get_world_polygons(level)
             meshes.append(mesh)
         return meshes
 
@@ -89,6 +166,7 @@ class DrawCall:
         return mesh
 
     def combine_meshes(self, meshes: list[Mesh]) -> Mesh:
+        "The combined mesh shares the polygons of the meshes."
         polygons = []
         for mesh in meshes:
             if mesh.polygons:
@@ -110,23 +188,97 @@ class DrawCall:
 
         return filtered_meshes
 
+    def release_meshes(self) -> None:
+        for body in self.objects:
+            body.physics.mesh.release_world_polygons()
+
     def draw(self):
-        meshes = self.get_meshes()
-        lights = self.get_lights(meshes)
+        profiler = self.profiler
+        self.frame_index += 1
+        self.apply_quality()
+        # The frustum filter needs the view axes before the first projection.
+        self.camera.apply_direction_adjustment()
+
+        with profiler.stage("get_meshes"):
+            meshes = self.get_meshes()
+            # Skipped frames keep the shaders of the last lit frame.
+            lights = self.get_lights(meshes) if self.is_lighting_frame() else []
+
+        if self.mesh_pipeline:
+            self.draw_meshes_parallel(meshes, lights)
+        else:
+            with profiler.stage("frustum_filter"):
+                meshes = self.filter_polygons(meshes)
+                meshes = self.filter_meshes(meshes)
+
+            if meshes:
+                self.draw_meshes(meshes, lights)
 
-        meshes = self.filter_polygons(meshes)
-        meshes = self.filter_meshes(meshes)
-        if not meshes:
-            return
+        self.release_meshes()
+
+        if self.particle_systems:
+            with profiler.stage("particles"):
+                self.draw_particles()
+
+    def draw_meshes(self, meshes: list[Mesh], lights: list[Light]) -> None:
+        profiler = self.profiler
 
         # mesh = self.combine_meshes(meshes)
         for mesh in meshes:
-            mesh = self.apply_z_buffer_sort(mesh)
-            mesh = self.cull_backfaces_mesh(mesh)
-            mesh = self.apply_lighting_mesh(mesh, lights)
-            mesh = self.apply_projection(mesh)
+            with profiler.stage("z_sort"):
+                mesh = self.apply_z_buffer_sort(mesh)
+            with profiler.stage("backface_cull"):
+                mesh = self.cull_backfaces_mesh(mesh)
+            with profiler.stage("lighting"):
+                mesh = self.apply_lighting_mesh(mesh, lights)
+            with profiler.stage("projection"):
+                mesh = self.apply_projection(mesh)
 
             # polygon_count = len(mesh.polygons)
             # console_overwrite(f"POLYGON COUNT: {polygon_count}")
 
-            self.graphics.draw_polygons(mesh)
+            with profiler.stage("draw_polygons"):
+                vertices, indices, colors = get_triangle_arrays(mesh)
+                self.graphics.draw_triangles(vertices, indices, colors)
+
+    def draw_meshes_parallel(self, meshes: list[Mesh], lights: list[Light]) -> None:
+        profiler = self.profiler
+        mesh_pipeline = self.mesh_pipeline
+
+        view = PipelineView.from_camera(self.camera)
+        material = PipelineMaterial.from_shaders(self.shaders)
+
+        # Meshes with quads are not packed and go through the serial stages.
+        is_supported = [mesh_pipeline.supports(mesh) for mesh in meshes]
+        supported_meshes = [m for m, s in zip(meshes, is_supported) if s]
+
+        with profiler.stage("mesh_pipeline"):
+            results = mesh_pipeline.process(supported_meshes, lights, view, material)
+        results = iter(results)
+
+        for mesh, supported in zip(meshes, is_supported):
+            if not supported:
+                mesh = self.camera.filter_polygons_outside_frustum(mesh)
+                if mesh.polygons:
+                    self.draw_meshes([mesh], lights)
+                continue
+
+            with profiler.stage("unpack"):
+                arrays = mesh_pipeline.get_screen_triangles(mesh, next(results))
+            with profiler.stage("draw_polygons"):
+                self.graphics.draw_triangles(*arrays)
+
+    def draw_particles(self) -> None:
+        view = PipelineView.from_camera(self.camera)
+        snapshot = self.physics_snapshot
+        for index, system in enumerate(self.particle_systems):
+            if snapshot and index < len(snapshot.particle_positions):
+                render_positions = system.interpolate_positions(
+                    snapshot.previous_particle_positions[index],
+                    snapshot.particle_positions[index],
+                    snapshot.alpha,
+                )
+            else:
+                render_positions = system.get_render_positions(self.interpolation_alpha)
+            points, radii = system.get_screen_particles(view, render_positions)
+            self.graphics.draw_circles(points, radii, system.color)
@@ -3,16 +3,19 @@ from components.color import RGBA
 from dataclasses import dataclass
 
 
+@dataclass(frozen=True)
 class FontType:
     font: str
     style: str
 
 
+@dataclass(frozen=True)
 class ArialFontNormal(FontType):
     font: str = "Arial"
     style: str = "normal"
 
 
+@dataclass(frozen=True)
 class ArialFontBold(FontType):
     font: str = "Arial"
     style: str = "bold"
@@ -2,22 +2,31 @@ import time
 from collections import deque
 
 from shared_dcs import FrameTime
+from components.profiler import FrameProfiler
+
+from typing import Optional
 
 
 class FrameTimeHandler:
-    def __init__(self, frame_count: int):
+    def __init__(self, frame_count: int, profiler: Optional[FrameProfiler] = None):
         self.frame_times = deque(maxlen=frame_count)
         self.frame_start = time.perf_counter()
         self.frame_count = frame_count
+        self.profiler = profiler
 
     def tick(self):
-        frame_time = time.perf_counter() - self.frame_start
-        self.frame_start = time.perf_counter()
+        frame_start = time.perf_counter()
+        frame_time = frame_start - self.frame_start
+        self.frame_start = frame_start
 
         self.frame_times.append(frame_time)
         if len(self.frame_times) > self.frame_count:
             self.frame_times.popleft()
 
+        if self.profiler:
+            self.profiler.record("frame", frame_time)
+            self.profiler.tick()
+
     def get_average_frame_time(self) -> float:
         if not self.frame_times:
             return 0.0
@@ -34,7 +43,15 @@ class FrameTimeHandler:
 
     def get_frametime_data(self) -> FrameTime:
         average_fps = self.get_frames_per_second()
+        stage_times = []
+        if self.profiler and self.profiler.enabled:
+            stage_times = self.profiler.stage_times
+
+        last_frame_time = self.frame_times[-1] if self.frame_times else 0.0
+
         frame_time = FrameTime(
             average_fps=average_fps,
+            frame_time=last_frame_time,
+            stage_times=stage_times,
         )
         return frame_time
@@ -21,13 +21,22 @@ class Frustum:
         self.fov = 90
         self.near_plane = 0.1
         self.far_plane = 100_000.0
+        self.far_plane_limit = float("inf")
+        self.planes = self.make_frustum()
+
+    def get_far_plane(self) -> float:
+        "Far plane used for clipping, the quality scaler can pull it closer."
+        return min(self.far_plane, self.far_plane_limit)
+
+    def set_far_plane_limit(self, far_plane_limit: float) -> None:
+        self.far_plane_limit = far_plane_limit
         self.planes = self.make_frustum()
 
     def make_frustum(self) -> list[Plane]:
         fov = self.fov
         aspect = self.width / self.height
         near = -self.near_plane
-        far = -self.far_plane
+        far = -self.get_far_plane()
         fov_rad = math.tan(math.radians(fov / 2))
 
         y_top = abs(near) * fov_rad
@@ -1,15 +1,20 @@
+import os
 import pygame as pyg
+import numpy as np
 import time
+import tkinter as tk
 from turtle import Turtle, Screen, ScrolledCanvas
 
-from shared_dcs import KeyRegister
+from shared_dcs import OverlayLine
 from components.polygons import Mesh, Triangle, Quad
 from components.font import FontSettings
-from components.color import RGBA
+from components.color import RGBA, MESH_LINE_SHADER, WHITE
 from abstracts.graphics_abc import GraphicsABC
 from components.utils import clamp_float
+from components.cache import LRUCache
+from components.input import KeyDispatcher
 
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
 
 
 class TurtleGraphicsBase(GraphicsABC):
@@ -163,6 +168,15 @@ class TurtleGraphics(TurtleGraphicsBase):
         self.turtle.circle(radius)
         self.draw_end_fill()
 
+    def draw_circles(
+        self,
+        points: np.ndarray,
+        radii: np.ndarray,
+        color: RGBA,
+    ) -> None:
+        for point, radius in zip(points.tolist(), radii.tolist()):
+            self.draw_circle(point, radius, color)
+
     def draw_line(
         self,
         point1: tuple[float, float],
@@ -212,8 +226,7 @@ class TurtleGraphics(TurtleGraphicsBase):
         line_rgb = color_rgb
 
         if mesh_lines:
-            line_shader = RGBA.from_rgb(0.8, 0.8, 0.8)
-            line_color = color.multiply(line_shader)
+            line_color = color.multiply(MESH_LINE_SHADER)
             line_color = line_color.clamp(0.0, 1.0)
             line_rgb = line_color.rgb_tuple
 
@@ -236,6 +249,35 @@ class TurtleGraphics(TurtleGraphicsBase):
         self.turtle.goto(p1)
         self.draw_end_fill()
 
+    def draw_triangles(
+        self,
+        vertices: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray,
+        mesh_lines: bool = False,
+    ) -> None:
+        points = vertices[indices, 0:2].tolist()
+        colors = colors / 255.0
+        if mesh_lines:
+            line_colors = (colors * 0.8).tolist()
+        else:
+            line_colors = colors.tolist()
+
+        for triangle_points, color_rgb, line_rgb in zip(
+            points, colors.tolist(), line_colors
+        ):
+            p1, p2, p3 = (self.get_centered_coordinates(p) for p in triangle_points)
+
+            self.turtle.pencolor(line_rgb)
+            self.turtle.fillcolor(color_rgb)
+            self.draw_begin_fill(p1)
+
+            self.turtle.pendown()
+            self.turtle.goto(p2)
+            self.turtle.goto(p3)
+            self.turtle.goto(p1)
+            self.draw_end_fill()
+
     def draw_quad(self, quad: Quad, mesh_lines: bool = False):
         vertices = quad.vertices
         shader = quad.shader
@@ -246,8 +288,7 @@ class TurtleGraphics(TurtleGraphicsBase):
         line_rgb = color_rgb
 
         if mesh_lines:
-            line_shader = RGBA.from_rgb(0.8, 0.8, 0.8)
-            line_color = color.multiply(line_shader)
+            line_color = color.multiply(MESH_LINE_SHADER)
             line_color = line_color.clamp(0.0, 1.0)
             line_rgb = line_color.rgb_tuple
 
@@ -283,6 +324,10 @@ class TurtleGraphics(TurtleGraphicsBase):
         self.turtle.pendown()
         self.turtle.write(arg=text, font=font_tuple, align="left")
 
+    def draw_overlay(self, lines: list[OverlayLine]) -> None:
+        for line in lines:
+            self.draw_text(line.point, line.text, line.font_settings)
+
     def clear_screen(self) -> None:
         self.turtle.clear()
 
@@ -292,26 +337,133 @@ class PygGraphicsBase(GraphicsABC):
         pyg.init()
         self.width = width
         self.height = height
-        self.screen = pyg.display.set_mode((width, height))
+        self.screen = self.create_screen(width, height)
         self.clock = pyg.time.Clock()
+        self.frame_cap: Optional[int] = 60
+        self.render_scale = 1.0
+        self.scene = self.screen
+        self.is_scene_resolved = True
         self.default_font = pyg.font.get_default_font()
-        self.bg_color = RGBA(1.0, 1.0, 1.0, 1.0)
-        self.registered_keys: list[KeyRegister] = []
+        self.font_cache: LRUCache[pyg.font.Font] = LRUCache(16)
+        self.text_cache: LRUCache[pyg.Surface] = LRUCache(256)
+        self.overlay: Optional[pyg.Surface] = None
+        self.overlay_lines: list[OverlayLine] = []
+        self.overlay_rects: list[pyg.Rect] = []
+        self.bg_color = WHITE
+        self.key_dispatcher = KeyDispatcher()
+        self.pointer_position = pyg.mouse.get_pos()
+        self.dirty_rects_enabled = False
+        self.drawn_rects: list[pyg.Rect] = []
+        self.cleared_rects: list[pyg.Rect] = []
+        self.needs_full_update = True
+        self.max_dirty_rects = 64
+
+    def create_screen(self, width: int, height: int) -> pyg.Surface:
+        return pyg.display.set_mode((width, height))
 
     def update(self) -> None:
         events = self.get_events()
-        self.set_onkeypress(events)
-        self.event_onkeypress()
-        pyg.display.flip()
-        self.clock.tick(60)
+        frame_time = time.monotonic()
+        self.set_onkeypress(events, frame_time)
+        self.event_onkeypress(frame_time)
+        self.present()
+        self.clock.tick(self.frame_cap or 0)
+
+    def set_frame_cap(self, frame_cap: Optional[int]) -> None:
+        "Caps the frame rate in update, None runs uncapped."
+        self.frame_cap = frame_cap
+
+    def get_frame_bytes(self) -> bytes:
+        "Copies the framebuffer as row-major RGB bytes."
+        self.resolve_scene()
+        return pyg.image.tobytes(self.screen, "RGB")
+
+    def set_render_scale(self, render_scale: float) -> None:
+        """Below 1.0 the scene is rasterized to a smaller offscreen surface,
+        which is upscaled onto the screen once before the overlay is drawn."""
+        self.render_scale = clamp_float(render_scale, 0.1, 1.0)
+        self.scene = self.create_scene()
+        self.needs_full_update = True
+
+    def create_scene(self) -> pyg.Surface:
+        if self.render_scale >= 1.0:
+            return self.screen
+
+        width, height = self.screen.get_size()
+        scene_width = max(1, round(width * self.render_scale))
+        scene_height = max(1, round(height * self.render_scale))
+        return pyg.Surface((scene_width, scene_height), 0, self.screen)
+
+    def is_scene_scaled(self) -> bool:
+        return self.scene is not self.screen
+
+    def get_scene_points(self, points: np.ndarray) -> np.ndarray:
+        "Screen points moved onto the scene surface."
+        if self.is_scene_scaled():
+            return points * self.render_scale
+        return points
+
+    def resolve_scene(self) -> None:
+        "Upscales the scene onto the screen, once per frame."
+        if self.is_scene_resolved:
+            return
+
+        self.is_scene_resolved = True
+        if self.is_scene_scaled():
+            pyg.transform.scale(self.scene, self.screen.get_size(), self.screen)
+
+    def set_dirty_rects(self, enabled: bool) -> None:
+        """In dirty rectangle mode only the areas drawn in this frame or in
+        the previous one are cleared and presented, instead of the whole
+        screen. Falls back to a full flip when those cover half the screen."""
+        self.dirty_rects_enabled = enabled
+        self.drawn_rects = []
+        self.cleared_rects = []
+        self.needs_full_update = True
+
+    def mark_dirty(self, rect: pyg.Rect) -> None:
+        if self.dirty_rects_enabled:
+            self.drawn_rects.append(rect)
+
+    def get_merged_rects(self, rects: list[pyg.Rect]) -> list[pyg.Rect]:
+        "Many small rects are merged into their union, which is cheaper to update."
+        if len(rects) > self.max_dirty_rects:
+            rects = [rects[0].unionall(rects[1:])]
+        screen_rect = self.screen.get_rect()
+        return [rect.clip(screen_rect) for rect in rects]
+
+    def get_dirty_rects(self) -> Optional[list[pyg.Rect]]:
+        "Areas to present this frame, None when the whole screen is needed."
+        if not self.dirty_rects_enabled or self.needs_full_update:
+            return None
+        if self.is_scene_scaled():
+            return None
+
+        rects = self.get_merged_rects(self.cleared_rects + self.drawn_rects)
+        dirty_area = sum(rect.width * rect.height for rect in rects)
+        if dirty_area * 2 > self.width * self.height:
+            return None
+        return rects
+
+    def present(self) -> None:
+        self.resolve_scene()
+        rects = self.get_dirty_rects()
+        if rects is None:
+            pyg.display.flip()
+        else:
+            pyg.display.update(rects)
+        self.needs_full_update = False
 
     def set_screensize(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
-        self.screen = pyg.display.set_mode((width, height))
+        self.screen = self.create_screen(width, height)
+        self.scene = self.create_scene()
+        self.needs_full_update = True
 
     def set_background_color(self, color: RGBA) -> None:
         self.bg_color = color
+        self.needs_full_update = True
 
     def set_title(self, title: str) -> None:
         self.title = title
@@ -328,70 +480,32 @@ class PygGraphicsBase(GraphicsABC):
         if key in scancodes:
             return scancodes[key]
 
-    def add_key_register(
-        self, key: str, scancode: int, func: Callable, is_repeatable: bool
-    ):
-        unix_time = time.time()
-        key_register = KeyRegister(
-            key=key,
-            scancode=scancode,
-            function=func,
-            press_time=unix_time,
-            is_pressed=False,
-            is_repeatable=is_repeatable,
-        )
-        self.registered_keys.append(key_register)
-
     def register_onkeypress(
         self, func: Callable, key: str, is_repeatable: bool = True
     ) -> None:
         if len(key) == 1:
             scancode = ord(key)
-            self.add_key_register(key, scancode, func, is_repeatable)
-
-        elif len(key) > 1:
+        else:
             scancode = self.get_available_scancode(key)
             if not scancode:
                 print(f"WARNING: '{key}' FAILED TO REGISTER.")
                 return
-            self.add_key_register(key, scancode, func, is_repeatable)
 
-    def set_onkeypress(self, events: list[pyg.event.Event]):
-        pressed = pyg.key.get_pressed()
+        press_time = time.monotonic()
+        self.key_dispatcher.add(key, scancode, func, is_repeatable, press_time)
 
+    def set_onkeypress(self, events: list[pyg.event.Event], frame_time: float):
+        "Mouse motion events are merged into the last pointer position."
         for event in events:
-            if event.type == pyg.KEYDOWN:
-                for key_register in self.registered_keys:
-                    scancode = key_register.scancode
-                    if pressed[scancode]:
-                        unix_time = time.time()
-                        key_register.is_pressed = True
-                        key_register.press_time = unix_time
-
-            if event.type == pyg.KEYUP:
-                for key_register in self.registered_keys:
-                    scancode = key_register.scancode
-                    is_repeatable = key_register.is_repeatable
-                    if not pressed[scancode] and is_repeatable:
-                        unix_time = time.time()
-                        key_register.is_pressed = False
-                        key_register.press_time = unix_time
-
-    def event_onkeypress(self):
-        key_delay = 0.03
-        for key_register in self.registered_keys:
-            if key_register.is_pressed:
-                press_time = key_register.press_time
-
-                unix_time = time.time()
-                time_interval = unix_time - press_time
-                if key_register.is_repeatable:
-                    if time_interval > key_delay:
-                        key_register.function()
-
-                else:
-                    key_register.function()
-                    key_register.is_pressed = False
+            if event.type == pyg.MOUSEMOTION:
+                self.pointer_position = event.pos
+            elif event.type == pyg.KEYDOWN:
+                self.key_dispatcher.press(event.key, frame_time)
+            elif event.type == pyg.KEYUP:
+                self.key_dispatcher.release(event.key, frame_time)
+
+    def event_onkeypress(self, frame_time: float):
+        self.key_dispatcher.dispatch(frame_time)
 
     def get_events(self) -> list[pyg.event.Event]:
         events = pyg.event.get()
@@ -411,8 +525,7 @@ class PygGraphicsBase(GraphicsABC):
         return height
 
     def get_pointer_xy(self) -> tuple[int, int]:
-        pointer_pos = pyg.mouse.get_pos()
-        return pointer_pos
+        return self.pointer_position
 
     def get_centered_coordinates(
         self, position: tuple[float, float]
@@ -423,8 +536,11 @@ class PygGraphicsBase(GraphicsABC):
 
 
 class PygGraphics(PygGraphicsBase):
+    max_stamp_radius = 8
+
     def __init__(self, width: int, height: int):
         super().__init__(width, height)
+        self.circle_stamps: dict[int, np.ndarray] = {}
 
     def set_draw_thickness(self, size: int) -> None:
         pass
@@ -449,9 +565,67 @@ class PygGraphics(PygGraphicsBase):
         radius: float,
         color: RGBA,
     ) -> None:
-        x, y = point
+        scale = self.render_scale if self.is_scene_scaled() else 1.0
+        x, y = point[0] * scale, point[1] * scale
         rgb_tuple = tuple(int(channel * 255) for channel in color.rgb_tuple)
-        pyg.draw.circle(self.screen, rgb_tuple, (int(x), int(y)), int(radius))
+        rect = pyg.draw.circle(
+            self.scene, rgb_tuple, (int(x), int(y)), int(radius * scale)
+        )
+        self.mark_dirty(rect)
+
+    def get_circle_stamp(self, radius: int) -> np.ndarray:
+        "(K, 2) pixel offsets from the center that pyg.draw.circle fills."
+        stamp = self.circle_stamps.get(radius)
+        if stamp is None:
+            size = 2 * radius + 3
+            surface = pyg.Surface((size, size))
+            pyg.draw.circle(surface, (255, 255, 255), (radius + 1, radius + 1), radius)
+            stamp = np.argwhere(pyg.surfarray.array_red(surface)) - (radius + 1)
+            self.circle_stamps[radius] = stamp
+        return stamp
+
+    def draw_circles(
+        self,
+        points: np.ndarray,
+        radii: np.ndarray,
+        color: RGBA,
+    ) -> None:
+        """Small circles are written into the pixels as precomputed stamps
+        of pyg.draw.circle, so they match draw_circle without a call per
+        circle. Larger circles are drawn one by one."""
+        if not len(points):
+            return
+
+        scale = self.render_scale if self.is_scene_scaled() else 1.0
+        centers = (points * scale).astype(np.int64)
+        radii = (radii * scale).astype(np.int64)
+        rgb_tuple = tuple(int(channel * 255) for channel in color.rgb_tuple)
+        if self.dirty_rects_enabled:
+            margin = int(radii.max())
+            left, top = (centers.min(axis=0) - margin).tolist()
+            right, bottom = (centers.max(axis=0) + margin).tolist()
+            self.mark_dirty(pyg.Rect(left, top, right - left + 1, bottom - top + 1))
+
+        stamped = (radii <= self.max_stamp_radius) & (radii > 0)
+        if self.scene.get_bytesize() == 3:
+            stamped[:] = False
+
+        if stamped.any():
+            width, height = self.scene.get_size()
+            pixels = pyg.surfarray.pixels2d(self.scene)
+            mapped_color = self.scene.map_rgb(rgb_tuple)
+            for radius in np.unique(radii[stamped]).tolist():
+                stamp = self.get_circle_stamp(radius)
+                circle_pixels = centers[radii == radius, np.newaxis, :] + stamp
+                circle_pixels = circle_pixels.reshape(-1, 2)
+                x, y = circle_pixels[:, 0], circle_pixels[:, 1]
+                inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+                pixels[x[inside], y[inside]] = mapped_color
+            del pixels
+
+        draw_circle = pyg.draw.circle
+        for center, radius in zip(centers[~stamped].tolist(), radii[~stamped].tolist()):
+            draw_circle(self.scene, rgb_tuple, center, radius)
 
     def draw_line(
         self,
@@ -461,7 +635,9 @@ class PygGraphics(PygGraphicsBase):
         color: RGBA,
     ) -> None:
         rgb_tuple = tuple(int(channel * 255) for channel in color.rgb_tuple)
-        pyg.draw.line(self.screen, rgb_tuple, point1, point2, thickness)
+        point1, point2 = self.get_scene_points(np.array((point1, point2))).tolist()
+        rect = pyg.draw.line(self.scene, rgb_tuple, point1, point2, thickness)
+        self.mark_dirty(rect)
 
     def apply_shader(
         self, color: tuple[int, int, int], shader: tuple[float, float, float]
@@ -493,16 +669,47 @@ class PygGraphics(PygGraphicsBase):
         p2 = v2.to_tuple()[:2]
         p3 = v3.to_tuple()[:2]
 
-        points = [p1, p2, p3]
+        points = self.get_scene_points(np.array((p1, p2, p3))).tolist()
 
-        pyg.draw.polygon(self.screen, color_u8, points)
+        rect = pyg.draw.polygon(self.scene, color_u8, points)
+        self.mark_dirty(rect)
 
         if mesh_lines:
-            line_shader = RGBA.from_rgb(0.8, 0.8, 0.8)
-            line_color = color.multiply(line_shader)
+            line_color = color.multiply(MESH_LINE_SHADER)
             color = color.clamp(0.0, 1.0)
             line_color_u8 = line_color.rgb_tuple_u8
-            pyg.draw.lines(self.screen, line_color_u8, True, points, 1)
+            pyg.draw.lines(self.scene, line_color_u8, True, points, 1)
+
+    def draw_triangles(
+        self,
+        vertices: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray,
+        mesh_lines: bool = False,
+    ) -> None:
+        screen = self.scene
+        draw_polygon = pyg.draw.polygon
+        points = self.get_scene_points(vertices[indices, 0:2])
+        if self.dirty_rects_enabled and len(points):
+            self.mark_dirty(self.get_points_rect(points))
+        points = points.tolist()
+
+        for triangle_points, color_u8 in zip(points, colors.tolist()):
+            draw_polygon(screen, color_u8, triangle_points)
+
+        if mesh_lines:
+            line_colors_u8 = (colors * 0.8).astype(np.uint8)
+            draw_lines = pyg.draw.lines
+            for triangle_points, color_u8 in zip(points, line_colors_u8.tolist()):
+                draw_lines(screen, color_u8, True, triangle_points, 1)
+
+    @staticmethod
+    def get_points_rect(points: np.ndarray) -> pyg.Rect:
+        "Bounds of (..., 2) screen points, with a pixel of margin for rounding."
+        points = points.reshape(-1, 2)
+        left, top = np.floor(points.min(axis=0)).tolist()
+        right, bottom = np.ceil(points.max(axis=0)).tolist()
+        return pyg.Rect(left - 1, top - 1, right - left + 3, bottom - top + 3)
 
     def draw_quad(self, quad: Quad, mesh_lines: bool):
         vertices = quad.vertices
@@ -518,26 +725,498 @@ class PygGraphics(PygGraphicsBase):
         p3 = v3.to_tuple()[:2]
         p4 = v4.to_tuple()[:2]
 
-        points = [p1, p2, p3, p4]
+        points = self.get_scene_points(np.array((p1, p2, p3, p4))).tolist()
 
-        pyg.draw.polygon(self.screen, color_u8, points)
+        rect = pyg.draw.polygon(self.scene, color_u8, points)
+        self.mark_dirty(rect)
         if mesh_lines:
-            line_shader = RGBA.from_rgb(0.8, 0.8, 0.8)
-            line_color = color.multiply(line_shader)
+            line_color = color.multiply(MESH_LINE_SHADER)
             line_color_u8 = line_color.rgb_tuple_u8
-            pyg.draw.lines(self.screen, line_color_u8, True, points, 1)
+            pyg.draw.lines(self.scene, line_color_u8, True, points, 1)
+
+    def get_font(self, font_tuple: tuple[str, int, str]) -> pyg.font.Font:
+        "Fonts are keyed by (face, size, style), the face is the default font."
+        font = self.font_cache.get(font_tuple)
+        if font is None:
+            _, font_size, font_style = font_tuple
+            font = pyg.font.Font(self.default_font, font_size)
+            font.set_bold(font_style == "bold")
+            self.font_cache.put(font_tuple, font)
+        return font
+
+    def get_text_surface(self, text: str, font_settings: FontSettings) -> pyg.Surface:
+        color = font_settings.font_color
+        rgb_tuple = tuple(int(channel * 255) for channel in color.rgb_tuple)
+        font_tuple = font_settings.font_tuple
+        key = (text, font_tuple, rgb_tuple)
+
+        text_surface = self.text_cache.get(key)
+        if text_surface is None:
+            font = self.get_font(font_tuple)
+            text_surface = font.render(text, True, rgb_tuple)
+            self.text_cache.put(key, text_surface)
+        return text_surface
 
     def draw_text(
         self, point: tuple[float, float], text: str, font_settings: FontSettings
     ) -> None:
+        self.resolve_scene()
         point = self.get_centered_coordinates(point)
-        font = pyg.font.Font(self.default_font, font_settings.font_tuple[1])
-        color = font_settings.font_color
-        rgb_tuple = tuple(int(channel * 255) for channel in color.rgb_tuple)
-        text_surface = font.render(text, True, rgb_tuple)
-        self.screen.blit(text_surface, point)
+        text_surface = self.get_text_surface(text, font_settings)
+        rect = self.screen.blit(text_surface, point)
+        self.mark_dirty(rect)
+
+    def get_overlay_surface(self) -> pyg.Surface:
+        size = self.screen.get_size()
+        if not self.overlay or self.overlay.get_size() != size:
+            self.overlay = pyg.Surface(size, pyg.SRCALPHA)
+            self.overlay_lines = []
+            self.overlay_rects = []
+        return self.overlay
+
+    def draw_overlay(self, lines: list[OverlayLine]) -> None:
+        """Text is kept on a retained overlay surface, only the lines that
+        differ from the previous call are cleared and rendered again. The
+        line areas of the overlay are composited onto the screen in one
+        blits call, leaving its transparent area untouched."""
+        overlay = self.get_overlay_surface()
+        drawn_lines = self.overlay_lines
+        rects = self.overlay_rects
+        clear_color = (0, 0, 0, 0)
+
+        for idx, line in enumerate(lines):
+            if idx < len(drawn_lines):
+                if drawn_lines[idx] == line:
+                    continue
+                overlay.fill(clear_color, rects[idx])
+
+            point = self.get_centered_coordinates(line.point)
+            text_surface = self.get_text_surface(line.text, line.font_settings)
+            rect = overlay.blit(text_surface, point, special_flags=pyg.BLEND_RGBA_MAX)
+            if idx < len(rects):
+                rects[idx] = rect
+            else:
+                rects.append(rect)
+
+        for rect in rects[len(lines) :]:
+            overlay.fill(clear_color, rect)
+        del rects[len(lines) :]
+        self.overlay_lines = list(lines)
+
+        self.resolve_scene()
+        blit_sequence = [(overlay, rect.topleft, rect) for rect in rects]
+        self.screen.blits(blit_sequence, doreturn=False)
+        if self.dirty_rects_enabled:
+            self.drawn_rects.extend(rect.copy() for rect in rects)
 
     def clear_screen(self) -> None:
         rgb_tuple = self.bg_color.rgb_tuple
         rgb_tuple = tuple(int(channel * 255) for channel in rgb_tuple)
-        self.screen.fill(rgb_tuple)
+        if self.is_scene_scaled():
+            self.scene.fill(rgb_tuple)
+            self.is_scene_resolved = False
+        elif self.dirty_rects_enabled and not self.needs_full_update:
+            for rect in self.get_merged_rects(self.drawn_rects):
+                self.screen.fill(rgb_tuple, rect)
+        else:
+            self.screen.fill(rgb_tuple)
+
+        self.cleared_rects = self.drawn_rects
+        self.drawn_rects = []
+
+
+class PygHeadlessGraphics(PygGraphics):
+    """Pygame backend that rasterizes into an offscreen surface.
+
+    No window is opened and no input is polled, which allows the full
+    pipeline to run on machines without a display."""
+
+    def __init__(self, width: int, height: int):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        super().__init__(width, height)
+        self.frame_count = 0
+
+    def create_screen(self, width: int, height: int) -> pyg.Surface:
+        return pyg.Surface((width, height))
+
+    def update(self) -> None:
+        self.frame_count += 1
+        self.present()
+
+    def present(self) -> None:
+        self.resolve_scene()
+        self.needs_full_update = False
+
+    def set_title(self, title: str) -> None:
+        self.title = title
+
+    def get_pointer_xy(self) -> tuple[int, int]:
+        return self.screen.get_rect().center
+
+    def get_frame_array(self) -> np.ndarray:
+        "Returns a copy of the framebuffer as a (height, width, 3) uint8 array."
+        self.resolve_scene()
+        frame_array = pyg.surfarray.array3d(self.screen)
+        return frame_array.transpose(1, 0, 2)
+
+
+class TkGraphics(GraphicsABC):
+    """Tk backend that draws straight onto a canvas.
+
+    Canvas items are pooled per kind and reused between frames by id. The
+    coordinates and colours of the triangles, circles and lines drawn in a
+    frame are collected into one Tcl script that update evaluates with a
+    single call, items the frame did not use are hidden. Only the overlay
+    lines that changed are configured again."""
+
+    item_kinds = ("polygon", "oval", "line", "text", "overlay")
+    item_types = {
+        "polygon": ("polygon", (0, 0, 0, 0, 0, 0)),
+        "oval": ("oval", (0, 0, 0, 0)),
+        "line": ("line", (0, 0, 0, 0)),
+        "text": ("text", (0, 0)),
+        "overlay": ("text", (0, 0)),
+    }
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.root = tk.Tk()
+        self.canvas = tk.Canvas(
+            self.root, width=width, height=height, highlightthickness=0
+        )
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas_path = str(self.canvas)
+        self.bg_color = WHITE
+        self.draw_thickness = 1
+        self.item_pools: dict[str, list[int]] = {kind: [] for kind in self.item_kinds}
+        self.item_colors: dict[int, str] = {}
+        self.used_items = dict.fromkeys(self.item_kinds, 0)
+        self.shown_items = dict.fromkeys(self.item_kinds, 0)
+        self.overlay_lines: list[OverlayLine] = []
+        self.script: list[str] = []
+        self.key_dispatcher = KeyDispatcher()
+        self.pointer_position = (width // 2, height // 2)
+        self.frame_cap: Optional[int] = 60
+        self.frame_start = time.monotonic()
+        self.is_closed = False
+        self.bind_events()
+
+    def bind_events(self) -> None:
+        self.root.bind_all("<KeyPress>", self.on_key_press)
+        self.root.bind_all("<KeyRelease>", self.on_key_release)
+        self.canvas.bind("<Motion>", self.on_pointer_motion)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_key_press(self, event: tk.Event) -> None:
+        self.key_dispatcher.press(event.keysym, time.monotonic())
+
+    def on_key_release(self, event: tk.Event) -> None:
+        self.key_dispatcher.release(event.keysym, time.monotonic())
+
+    def on_pointer_motion(self, event: tk.Event) -> None:
+        self.pointer_position = (event.x, event.y)
+
+    def on_close(self) -> None:
+        self.is_closed = True
+
+    def update(self) -> None:
+        self.flush_items()
+        self.root.update()
+        if self.is_closed:
+            self.root.destroy()
+            raise SystemExit
+
+        frame_time = time.monotonic()
+        self.key_dispatcher.dispatch(frame_time)
+        if self.frame_cap:
+            delay = 1.0 / self.frame_cap - (frame_time - self.frame_start)
+            if delay > 0.0:
+                time.sleep(delay)
+                frame_time += delay
+        self.frame_start = frame_time
+
+    def set_frame_cap(self, frame_cap: Optional[int]) -> None:
+        "Caps the frame rate in update, None runs uncapped."
+        self.frame_cap = frame_cap
+
+    def flush_items(self) -> None:
+        "Shows or hides the pooled items whose use changed, then runs the script."
+        canvas = self.canvas_path
+        script = self.script
+        for kind in self.item_kinds:
+            used = self.used_items[kind]
+            shown = self.shown_items[kind]
+            if used == shown:
+                continue
+
+            state = "normal" if used > shown else "hidden"
+            for item in self.item_pools[kind][min(used, shown) : max(used, shown)]:
+                script.append(f"{canvas} itemconfigure {item} -state {state}")
+            self.shown_items[kind] = used
+
+        if script:
+            self.root.tk.eval("\n".join(script))
+            script.clear()
+
+    def get_items(self, kind: str, count: int) -> list[int]:
+        """Takes the next `count` items of a kind for this frame. New items
+        are created hidden and stacked under the kinds drawn after it."""
+        pool = self.item_pools[kind]
+        start = self.used_items[kind]
+        end = start + count
+        if end > len(pool):
+            item_type, coordinates = self.item_types[kind]
+            create_item = getattr(self.canvas, f"create_{item_type}")
+            for _ in range(end - len(pool)):
+                item = create_item(*coordinates, state="hidden", tags=kind)
+                pool.append(item)
+            for upper_kind in self.item_kinds[self.item_kinds.index(kind) + 1 :]:
+                self.canvas.tag_raise(upper_kind)
+
+        self.used_items[kind] = end
+        return pool[start:end]
+
+    def set_item_colors(self, item: int, fill: str, outline: str) -> None:
+        "Configures the colours of an item only when they changed."
+        colors = f"-fill {fill} -outline {outline}"
+        if self.item_colors.get(item) != colors:
+            self.item_colors[item] = colors
+            self.script.append(f"{self.canvas_path} itemconfigure {item} {colors}")
+
+    @staticmethod
+    def get_hex_color(rgb_u8: tuple[int, int, int]) -> str:
+        return "#%02x%02x%02x" % tuple(rgb_u8)
+
+    @classmethod
+    def get_rgba_hex(cls, color: RGBA) -> str:
+        color = color.clamp(0.0, 1.0)
+        return cls.get_hex_color(color.rgb_tuple_u8)
+
+    punctuation_keysyms = {
+        " ": "space",
+        ".": "period",
+        ",": "comma",
+        "/": "slash",
+        "\\": "backslash",
+        ";": "semicolon",
+        ":": "colon",
+        "'": "apostrophe",
+        '"': "quotedbl",
+        "[": "bracketleft",
+        "]": "bracketright",
+        "{": "braceleft",
+        "}": "braceright",
+        "(": "parenleft",
+        ")": "parenright",
+        "<": "less",
+        ">": "greater",
+        "-": "minus",
+        "_": "underscore",
+        "=": "equal",
+        "+": "plus",
+        "`": "grave",
+        "~": "asciitilde",
+        "!": "exclam",
+        "?": "question",
+        "@": "at",
+        "#": "numbersign",
+        "$": "dollar",
+        "%": "percent",
+        "^": "asciicircum",
+        "&": "ampersand",
+        "*": "asterisk",
+        "|": "bar",
+    }
+
+    def get_keysym(self, key: str) -> str:
+        "Tk reports punctuation by keysym name, e.g. '.' as 'period'."
+        return self.punctuation_keysyms.get(key, key)
+
+    def register_onkeypress(
+        self, func: Callable, key: str, is_repeatable: bool = True
+    ) -> None:
+        keysym = self.get_keysym(key)
+        self.key_dispatcher.add(key, keysym, func, is_repeatable, time.monotonic())
+
+    def set_screensize(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.canvas.configure(width=width, height=height)
+
+    def set_background_color(self, color: RGBA) -> None:
+        self.bg_color = color
+        self.canvas.configure(background=self.get_rgba_hex(color))
+
+    def set_title(self, title: str) -> None:
+        self.root.title(title)
+
+    def get_screensize(self) -> tuple[int, int]:
+        return self.get_width(), self.get_height()
+
+    def get_width(self) -> int:
+        "The configured size, winfo_width is 1 until the window is mapped."
+        return self.width
+
+    def get_height(self) -> int:
+        return self.height
+
+    def get_pointer_xy(self) -> tuple[int, int]:
+        return self.pointer_position
+
+    def get_centered_coordinates(
+        self, position: tuple[float, float]
+    ) -> tuple[float, float]:
+        cx = self.width / 2
+        cy = self.height / 2
+        return position[0] + cx, -position[1] + cy
+
+    def set_draw_thickness(self, size: int) -> None:
+        self.draw_thickness = size
+
+    def draw_circle(
+        self,
+        point: tuple[float, float],
+        radius: float,
+        color: RGBA,
+    ) -> None:
+        (item,) = self.get_items("oval", 1)
+        x, y = point
+        fill = self.get_rgba_hex(color)
+        self.script.append(
+            f"{self.canvas_path} coords {item} "
+            f"{x - radius:.1f} {y - radius:.1f} {x + radius:.1f} {y + radius:.1f}"
+        )
+        self.set_item_colors(item, fill, fill)
+
+    def draw_circles(
+        self,
+        points: np.ndarray,
+        radii: np.ndarray,
+        color: RGBA,
+    ) -> None:
+        if not len(points):
+            return
+
+        items = self.get_items("oval", len(points))
+        corners = np.concatenate(
+            (points - radii[:, np.newaxis], points + radii[:, np.newaxis]), axis=1
+        )
+        fill = self.get_rgba_hex(color)
+        coords = f"{self.canvas_path} coords %d %.1f %.1f %.1f %.1f"
+        self.script.extend(
+            coords % (item, *circle_corners)
+            for item, circle_corners in zip(items, corners.tolist())
+        )
+        for item in items:
+            self.set_item_colors(item, fill, fill)
+
+    def draw_line(
+        self,
+        point1: tuple[float, float],
+        point2: tuple[float, float],
+        thickness: int,
+        color: RGBA,
+    ) -> None:
+        (item,) = self.get_items("line", 1)
+        (x1, y1), (x2, y2) = point1, point2
+        fill = self.get_rgba_hex(color)
+        self.script.append(
+            f"{self.canvas_path} coords {item} {x1:.1f} {y1:.1f} {x2:.1f} {y2:.1f}\n"
+            f"{self.canvas_path} itemconfigure {item} -fill {fill} -width {thickness}"
+        )
+
+    def draw_polygons(self, mesh: Mesh, mesh_lines: bool = False) -> None:
+        for polygon in mesh.polygons:
+            if isinstance(polygon.shape, Triangle):
+                self.draw_triangle(polygon.shape, mesh_lines)
+            elif isinstance(polygon.shape, Quad):
+                self.draw_quad(polygon.shape, mesh_lines)
+
+    def draw_shape(self, shape: Union[Triangle, Quad], mesh_lines: bool) -> None:
+        color = shape.color.multiply(shape.shader)
+        color = color.clamp(0.0, 1.0)
+        fill = self.get_hex_color(color.rgb_tuple_u8)
+        outline = fill
+        if mesh_lines:
+            line_color = color.multiply(MESH_LINE_SHADER)
+            outline = self.get_hex_color(line_color.rgb_tuple_u8)
+
+        (item,) = self.get_items("polygon", 1)
+        points = [f"{v.x:.1f} {v.y:.1f}" for v in shape.vertices]
+        self.script.append(f"{self.canvas_path} coords {item} {' '.join(points)}")
+        self.set_item_colors(item, fill, outline)
+
+    def draw_triangle(self, triangle: Triangle, mesh_lines: bool = False) -> None:
+        self.draw_shape(triangle, mesh_lines)
+
+    def draw_quad(self, quad: Quad, mesh_lines: bool = False) -> None:
+        self.draw_shape(quad, mesh_lines)
+
+    def draw_triangles(
+        self,
+        vertices: np.ndarray,
+        indices: np.ndarray,
+        colors: np.ndarray,
+        mesh_lines: bool = False,
+    ) -> None:
+        if not len(indices):
+            return
+
+        items = self.get_items("polygon", len(indices))
+        points = vertices[indices, 0:2].reshape(-1, 6).tolist()
+        fills = [self.get_hex_color(color) for color in colors.tolist()]
+        if mesh_lines:
+            line_colors = (colors * 0.8).astype(np.uint8).tolist()
+            outlines = [self.get_hex_color(color) for color in line_colors]
+        else:
+            outlines = fills
+
+        canvas = self.canvas_path
+        coords = f"{canvas} coords %d %.1f %.1f %.1f %.1f %.1f %.1f"
+        self.script.extend(
+            coords % (item, *triangle_points)
+            for item, triangle_points in zip(items, points)
+        )
+        for item, fill, outline in zip(items, fills, outlines):
+            self.set_item_colors(item, fill, outline)
+
+    def configure_text(
+        self,
+        item: int,
+        point: tuple[float, float],
+        text: str,
+        font_settings: FontSettings,
+    ) -> None:
+        x, y = self.get_centered_coordinates(point)
+        self.canvas.coords(item, x, y)
+        self.canvas.itemconfigure(
+            item,
+            text=text,
+            font=font_settings.font_tuple,
+            fill=self.get_rgba_hex(font_settings.font_color),
+            anchor="nw",
+        )
+
+    def draw_text(
+        self, point: tuple[float, float], text: str, font_settings: FontSettings
+    ) -> None:
+        (item,) = self.get_items("text", 1)
+        self.configure_text(item, point, text, font_settings)
+
+    def draw_overlay(self, lines: list[OverlayLine]) -> None:
+        "Overlay items keep their text between frames, changed lines are updated."
+        self.used_items["overlay"] = 0
+        items = self.get_items("overlay", len(lines))
+        drawn_lines = self.overlay_lines
+        for idx, (item, line) in enumerate(zip(items, lines)):
+            if idx < len(drawn_lines) and drawn_lines[idx] == line:
+                continue
+            self.configure_text(item, line.point, line.text, line.font_settings)
+        self.overlay_lines = list(lines)
+
+    def clear_screen(self) -> None:
+        "Items are reused by the next frame, those it leaves unused are hidden."
+        for kind in self.item_kinds:
+            if kind != "overlay":
+                self.used_items[kind] = 0
@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class DirectGravity:
+    """Exact all-pairs gravity over position and mass arrays.
+
+    Pairs are evaluated in square tiles of at most `tile_size` bodies per
+    side, so memory stays bounded for any body count. Every pair of tiles
+    is computed once and applied to both tiles with opposite signs, as
+    Newton's third law allows.
+
+    Plummer softening replaces r^2 with r^2 + softening^2, keeping close
+    encounters finite. Without softening, coincident bodies exert no force
+    on each other, like Physics.apply_attraction."""
+
+    def __init__(
+        self, g_const: float = 0.1, softening: float = 0.0, tile_size: int = 512
+    ):
+        self.g_const = g_const
+        self.softening = softening
+        self.tile_size = tile_size
+
+    def get_pair_factors(
+        self, targets: np.ndarray, sources: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        "Returns the target-to-source vectors and 1 / r^3 for every pair."
+        distance_vectors = sources[np.newaxis, :, :] - targets[:, np.newaxis, :]
+        distances_sq = np.einsum("abk,abk->ab", distance_vectors, distance_vectors)
+        distances_sq += self.softening**2
+
+        with np.errstate(divide="ignore"):
+            inverse_cubed = np.where(distances_sq > 0.0, distances_sq**-1.5, 0.0)
+        return distance_vectors, inverse_cubed
+
+    def get_accelerations(
+        self, positions: np.ndarray, masses: np.ndarray
+    ) -> np.ndarray:
+        "Accelerations of all bodies, (N, 3) positions and (N,) masses."
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        masses = np.asarray(masses, dtype=np.float64)
+        count = len(positions)
+        tile_size = self.tile_size
+        accelerations = np.zeros((count, 3))
+
+        for start_i in range(0, count, tile_size):
+            end_i = min(start_i + tile_size, count)
+            targets = positions[start_i:end_i]
+            target_masses = masses[start_i:end_i]
+
+            for start_j in range(start_i, count, tile_size):
+                end_j = min(start_j + tile_size, count)
+                sources = positions[start_j:end_j]
+                source_masses = masses[start_j:end_j]
+
+                distance_vectors, inverse_cubed = self.get_pair_factors(
+                    targets, sources
+                )
+                pulls = inverse_cubed * source_masses[np.newaxis, :]
+                accelerations[start_i:end_i] += np.einsum(
+                    "ab,abk->ak", pulls, distance_vectors
+                )
+                if start_i == start_j:
+                    continue
+
+                pulls = inverse_cubed * target_masses[:, np.newaxis]
+                accelerations[start_j:end_j] -= np.einsum(
+                    "ab,abk->bk", pulls, distance_vectors
+                )
+
+        return accelerations * self.g_const
+
+    def get_potential_energy(self, positions: np.ndarray, masses: np.ndarray) -> float:
+        "Total softened potential energy, every pair counted once."
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        masses = np.asarray(masses, dtype=np.float64)
+        count = len(positions)
+        tile_size = self.tile_size
+        energy = 0.0
+
+        for start_i in range(0, count, tile_size):
+            end_i = min(start_i + tile_size, count)
+            targets = positions[start_i:end_i]
+
+            for start_j in range(start_i, count, tile_size):
+                end_j = min(start_j + tile_size, count)
+                sources = positions[start_j:end_j]
+
+                distance_vectors = sources[np.newaxis, :, :] - targets[:, np.newaxis, :]
+                distances_sq = np.einsum(
+                    "abk,abk->ab", distance_vectors, distance_vectors
+                )
+                distances_sq += self.softening**2
+                with np.errstate(divide="ignore"):
+                    inverse = np.where(distances_sq > 0.0, distances_sq**-0.5, 0.0)
+
+                pair_masses = np.outer(masses[start_i:end_i], masses[start_j:end_j])
+                pair_energies = pair_masses * inverse
+                if start_i == start_j:
+                    pair_energies = np.triu(pair_energies, k=1)
+                energy -= float(pair_energies.sum())
+
+        return energy * self.g_const
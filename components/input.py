@@ -0,0 +1,64 @@
+from shared_dcs import KeyRegister
+
+from typing import Callable, Union
+
+
+class KeyDispatcher:
+    """Calls the functions bound to keys.
+
+    Registers are looked up by key code and only the pressed ones are
+    visited every frame, so the cost does not grow with the number of
+    bindings. Repeatable functions run every frame once their key has been
+    held for `key_delay` seconds, the others once per press."""
+
+    def __init__(self, key_delay: float = 0.03):
+        self.key_delay = key_delay
+        self.key_registers: dict[Union[int, str], list[KeyRegister]] = {}
+        self.pressed_keys: list[KeyRegister] = []
+
+    def add(
+        self,
+        key: str,
+        key_code: Union[int, str],
+        func: Callable,
+        is_repeatable: bool,
+        press_time: float,
+    ) -> None:
+        key_register = KeyRegister(
+            key=key,
+            scancode=key_code,
+            function=func,
+            press_time=press_time,
+            is_pressed=False,
+            is_repeatable=is_repeatable,
+        )
+        self.key_registers.setdefault(key_code, []).append(key_register)
+
+    def press(self, key_code: Union[int, str], press_time: float) -> None:
+        for key_register in self.key_registers.get(key_code, ()):
+            if key_register not in self.pressed_keys:
+                self.pressed_keys.append(key_register)
+            key_register.is_pressed = True
+            key_register.press_time = press_time
+
+    def release(self, key_code: Union[int, str], release_time: float) -> None:
+        for key_register in self.key_registers.get(key_code, ()):
+            if key_register.is_repeatable:
+                key_register.is_pressed = False
+                key_register.press_time = release_time
+
+    def dispatch(self, frame_time: float) -> None:
+        pressed_keys = []
+        for key_register in self.pressed_keys:
+            if not key_register.is_pressed:
+                continue
+
+            if key_register.is_repeatable:
+                if frame_time - key_register.press_time > self.key_delay:
+                    key_register.function()
+                pressed_keys.append(key_register)
+
+            else:
+                key_register.function()
+                key_register.is_pressed = False
+        self.pressed_keys = pressed_keys
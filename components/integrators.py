@@ -0,0 +1,218 @@
+import numpy as np
+
+from abstracts.integrator_abc import IntegratorABC, AccelerationFunction
+
+from typing import Optional
+
+
+class EulerIntegrator(IntegratorABC):
+    """The update Physics._calculate_position uses: the acceleration at the
+    start of the step moves the position and the velocity. First order and
+    not symplectic, orbits gain energy with every step."""
+
+    name = "euler"
+
+    def step(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        accelerations = get_accelerations(positions)
+        positions = (
+            positions + velocities * timestep + accelerations * (0.5 * timestep**2)
+        )
+        velocities = velocities + accelerations * timestep
+        return positions, velocities
+
+
+class LeapfrogIntegrator(IntegratorABC):
+    """Drift-kick-drift leapfrog. Second order and symplectic, one force
+    evaluation per step."""
+
+    name = "leapfrog"
+
+    def step(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        half_step = 0.5 * timestep
+        positions = positions + velocities * half_step
+        velocities = velocities + get_accelerations(positions) * timestep
+        positions = positions + velocities * half_step
+        return positions, velocities
+
+
+class VelocityVerletIntegrator(IntegratorABC):
+    """Velocity Verlet. Second order and symplectic. The accelerations at
+    the end of a step are kept and reused at the start of the next one
+    while the positions are unchanged, so a step costs one evaluation."""
+
+    name = "verlet"
+
+    def __init__(self):
+        self.last_positions: Optional[np.ndarray] = None
+        self.last_accelerations: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        self.last_positions = None
+        self.last_accelerations = None
+
+    def get_start_accelerations(
+        self, positions: np.ndarray, get_accelerations: AccelerationFunction
+    ) -> np.ndarray:
+        last_positions = self.last_positions
+        if last_positions is not None and np.array_equal(last_positions, positions):
+            return self.last_accelerations
+        return get_accelerations(positions)
+
+    def step(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        accelerations = self.get_start_accelerations(positions, get_accelerations)
+        positions = (
+            positions + velocities * timestep + accelerations * (0.5 * timestep**2)
+        )
+        new_accelerations = get_accelerations(positions)
+        velocities = velocities + (accelerations + new_accelerations) * (0.5 * timestep)
+
+        self.last_positions = positions
+        self.last_accelerations = new_accelerations
+        return positions, velocities
+
+
+class RK4Integrator(IntegratorABC):
+    """Classic fourth order Runge-Kutta. Very accurate for short runs but
+    not symplectic, so energy slowly drifts. Four evaluations per step."""
+
+    name = "rk4"
+
+    def step(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        half_step = 0.5 * timestep
+
+        k1_x = velocities
+        k1_v = get_accelerations(positions)
+        k2_x = velocities + k1_v * half_step
+        k2_v = get_accelerations(positions + k1_x * half_step)
+        k3_x = velocities + k2_v * half_step
+        k3_v = get_accelerations(positions + k2_x * half_step)
+        k4_x = velocities + k3_v * timestep
+        k4_v = get_accelerations(positions + k3_x * timestep)
+
+        sixth_step = timestep / 6.0
+        positions = positions + (k1_x + 2.0 * (k2_x + k3_x) + k4_x) * sixth_step
+        velocities = velocities + (k1_v + 2.0 * (k2_v + k3_v) + k4_v) * sixth_step
+        return positions, velocities
+
+
+class AdaptiveIntegrator(IntegratorABC):
+    """Step doubling around another integrator. A step is compared with two
+    half steps and split further while the positions differ by more than
+    `tolerance` world units, up to 2 ** max_depth substeps. This keeps
+    the fixed outer timestep and only spends work on close encounters."""
+
+    name = "adaptive"
+
+    def __init__(
+        self,
+        integrator: Optional[IntegratorABC] = None,
+        tolerance: float = 0.01,
+        max_depth: int = 6,
+    ):
+        self.integrator = integrator if integrator else VelocityVerletIntegrator()
+        self.tolerance = tolerance
+        self.max_depth = max_depth
+        self.substeps = 0
+
+    def reset(self) -> None:
+        self.integrator.reset()
+
+    def step_adaptive(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+        depth: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        integrator = self.integrator
+        half_step = 0.5 * timestep
+
+        full_positions, _ = integrator.step(
+            positions, velocities, timestep, get_accelerations
+        )
+        half_state = integrator.step(
+            positions, velocities, half_step, get_accelerations
+        )
+        half_state = integrator.step(*half_state, half_step, get_accelerations)
+
+        error = np.abs(full_positions - half_state[0]).max(initial=0.0)
+        if error <= self.tolerance or depth >= self.max_depth:
+            self.substeps += 2
+            return half_state
+
+        depth += 1
+        state = self.step_adaptive(
+            positions, velocities, half_step, get_accelerations, depth
+        )
+        return self.step_adaptive(*state, half_step, get_accelerations, depth)
+
+    def step(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        timestep: float,
+        get_accelerations: AccelerationFunction,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        self.substeps = 0
+        return self.step_adaptive(positions, velocities, timestep, get_accelerations, 0)
+
+
+INTEGRATORS: dict[str, type[IntegratorABC]] = {
+    EulerIntegrator.name: EulerIntegrator,
+    LeapfrogIntegrator.name: LeapfrogIntegrator,
+    VelocityVerletIntegrator.name: VelocityVerletIntegrator,
+    RK4Integrator.name: RK4Integrator,
+    AdaptiveIntegrator.name: AdaptiveIntegrator,
+}
+
+
+def get_integrator(name: str) -> IntegratorABC:
+    return INTEGRATORS[name]()
+
+
+class EnergyMonitor:
+    """Relative drift of the total energy from the first measurement
+    after the last reset."""
+
+    def __init__(self):
+        self.initial_energy: Optional[float] = None
+        self.drift = 0.0
+
+    def reset(self) -> None:
+        self.initial_energy = None
+        self.drift = 0.0
+
+    def update(self, energy: float) -> float:
+        if self.initial_energy is None:
+            self.initial_energy = energy
+
+        if self.initial_energy == 0.0:
+            self.drift = 0.0
+        else:
+            self.drift = (energy - self.initial_energy) / abs(self.initial_energy)
+        return self.drift
@@ -0,0 +1,146 @@
+import math
+
+from components.vectors import Vector3D
+from components.polygons import Mesh, Triangle, Quad, Polygon
+
+
+class VertexClustering:
+    """Simplifies a mesh by snapping its vertices onto a uniform grid.
+
+    Vertices sharing a grid cell are merged into their average position,
+    polygons that collapse to fewer than three distinct cells are dropped."""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+
+    def get_cell(self, vertex: Vector3D) -> tuple[int, int, int]:
+        cell_size = self.cell_size
+        x = math.floor(vertex.x / cell_size)
+        y = math.floor(vertex.y / cell_size)
+        z = math.floor(vertex.z / cell_size)
+        return (x, y, z)
+
+    def get_cluster_vertices(
+        self, polygons: list[Polygon]
+    ) -> dict[tuple[int, int, int], Vector3D]:
+        sums: dict[tuple[int, int, int], tuple[Vector3D, int]] = {}
+
+        for polygon in polygons:
+            for vertex in polygon.shape.vertices:
+                cell = self.get_cell(vertex)
+                vertex_sum, count = sums.get(cell, (Vector3D(0.0, 0.0, 0.0), 0))
+                sums[cell] = (vertex_sum.add_vector(vertex), count + 1)
+
+        clusters = {}
+        for cell, (vertex_sum, count) in sums.items():
+            clusters[cell] = vertex_sum.divide(count)
+        return clusters
+
+    def simplify(self, mesh: Mesh) -> Mesh:
+        polygons = mesh.original_polygons
+        clusters = self.get_cluster_vertices(polygons)
+        cluster_ids = {cell: idx for idx, cell in enumerate(clusters)}
+
+        seen_faces = set()
+        simplified_polygons = []
+
+        for polygon in polygons:
+            shape = polygon.shape
+            cells = []
+            for vertex in shape.vertices:
+                cell = self.get_cell(vertex)
+                if cell not in cells:
+                    cells.append(cell)
+
+            if len(cells) < 3:
+                continue
+
+            face = tuple(cluster_ids[cell] for cell in cells)
+            face_key = frozenset(face)
+            if face_key in seen_faces:
+                continue
+            seen_faces.add(face_key)
+
+            vertices = tuple(clusters[cell] for cell in cells)
+            if len(vertices) == 3:
+                simplified = Triangle(vertices, face, shape.shader, shape.color)
+            else:
+                simplified = Quad(vertices, face, shape.shader, shape.color)
+            simplified_polygons.append(Polygon(simplified))
+
+        return Mesh(simplified_polygons)
+
+
+class LODGenerator:
+    """Builds coarser versions of a mesh at load time.
+
+    Each level uses a clustering cell twice the size of the previous one,
+    starting from a fraction of the mesh bounding diameter."""
+
+    def __init__(self, levels: int = 4, base_fraction: float = 1.0 / 32.0):
+        self.levels = levels
+        self.base_fraction = base_fraction
+        self.min_reduction = 0.9
+        self.min_polygons = 4
+
+    def generate(self, mesh: Mesh) -> Mesh:
+        _, radius = mesh.get_bounding_sphere()
+        cell_size = 2.0 * radius * self.base_fraction
+        polygon_count = len(mesh.original_polygons)
+
+        mesh.lods = []
+        for _ in range(self.levels):
+            if cell_size <= 0.0:
+                break
+
+            lod = VertexClustering(cell_size).simplify(mesh)
+            lod_count = len(lod.original_polygons)
+            if lod_count < self.min_polygons:
+                break
+
+            if lod_count <= polygon_count * self.min_reduction:
+                lod.lod_error = cell_size
+                mesh.lods.append(lod)
+                polygon_count = lod_count
+
+            cell_size *= 2.0
+        return mesh
+
+
+class LODSelector:
+    """Picks the coarsest level of detail whose geometric error,
+    projected onto the screen, stays below a pixel threshold."""
+
+    def __init__(self, max_error_px: float = 2.0):
+        self.max_error_px = max_error_px
+
+    def get_pixels_per_unit(
+        self, distance: float, fov: float, screen_height: int
+    ) -> float:
+        fov_tan = math.tan(math.radians(fov / 2.0))
+        return (screen_height / 2.0) / (distance * fov_tan)
+
+    def select_level(
+        self,
+        mesh: Mesh,
+        camera_position: Vector3D,
+        fov: float,
+        screen_height: int,
+    ) -> int:
+        if not mesh.lods:
+            return 0
+
+        center, radius = mesh.get_bounding_sphere()
+        distance = camera_position.get_distance(center)
+        if distance <= radius:
+            return 0
+
+        pixels_per_unit = self.get_pixels_per_unit(distance, fov, screen_height)
+
+        level = 0
+        for idx, lod in enumerate(mesh.lods, 1):
+            error_px = lod.lod_error * pixels_per_unit
+            if error_px > self.max_error_px:
+                break
+            level = idx
+        return level
@@ -0,0 +1,544 @@
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from components.camera import Camera
+from components.shaders import Shaders
+from components.light import Light
+from components.color import RGBA
+from components.polygons import Mesh, Triangle
+
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+# Floats stored per triangle in the shared segment: 3 vertices, a shader
+# and the base color.
+TRIANGLE_FLOATS = 9 + 4 + 3
+
+
+@dataclass(frozen=True)
+class PipelineView:
+    camera_position: tuple[float, float, float]
+    side_direction: tuple[float, float, float]
+    up_direction: tuple[float, float, float]
+    look_direction: tuple[float, float, float]
+    planes: tuple[tuple[float, float, float, float], ...]
+    fov: float
+    near_plane: float
+    far_plane: float
+    width: int
+    height: int
+    enable_clipping: bool
+
+    @classmethod
+    def from_camera(cls, camera: Camera) -> "PipelineView":
+        frustum = camera.frustum
+        planes = tuple((p.A, p.B, p.C, p.D) for p in frustum.planes)
+        view = cls(
+            camera_position=camera.camera_position.to_tuple(),
+            side_direction=camera.side_direction.to_tuple(),
+            up_direction=camera.up_direction.to_tuple(),
+            look_direction=camera.look_direction.to_tuple(),
+            planes=planes,
+            fov=frustum.fov,
+            near_plane=frustum.near_plane,
+            far_plane=frustum.far_plane,
+            width=frustum.width,
+            height=frustum.height,
+            enable_clipping=camera.enable_frustum_clipping,
+        )
+        return view
+
+
+@dataclass(frozen=True)
+class PipelineMaterial:
+    roughness: float
+    k_s: float
+    k_d: float
+    f0: float
+    constant_attenuation: float
+    linear_attenuation: float
+    quadratic_attenuation: float
+
+    @classmethod
+    def from_shaders(cls, shaders: Shaders) -> "PipelineMaterial":
+        material = cls(
+            roughness=shaders.roughness,
+            k_s=shaders.k_s,
+            k_d=shaders.k_d,
+            f0=shaders.f0,
+            constant_attenuation=shaders.constant_attenuation,
+            linear_attenuation=shaders.linear_attenuation,
+            quadratic_attenuation=shaders.quadratic_attenuation,
+        )
+        return material
+
+
+class MeshResult(NamedTuple):
+    "Output of the pipeline for one mesh, in back-to-front order."
+
+    lit_indices: np.ndarray  # (K,) triangles that survived culling
+    shaders: np.ndarray  # (K, 4) their shaders after lighting
+    colors: np.ndarray  # (K, 3) their final uint8 face colors
+    screen_vertices: np.ndarray  # (M, 3, 3) clipped and projected triangles
+    sources: np.ndarray  # (M,) index into lit_indices for each triangle
+
+
+def get_face_colors(colors: np.ndarray, shaders: np.ndarray) -> np.ndarray:
+    "Final uint8 RGB of every face, the base colors shaded and clamped."
+    shaded = colors[:, 0:3] * shaders[:, 0:3]
+    np.clip(shaded, 0.0, 1.0, out=shaded)
+    shaded *= 255.0
+    return shaded.astype(np.uint8)
+
+
+def get_light_array(lights: list[Light]) -> np.ndarray:
+    "Packs the lights as rows of position, target, ambient, diffuse, specular, lumens."
+    rows = []
+    for light in lights:
+        row = (
+            light.position.to_tuple()
+            + light.target.to_tuple()
+            + light.ambient.to_tuple()
+            + light.diffuse.to_tuple()
+            + light.specular.to_tuple()
+            + (light.lumens,)
+        )
+        rows.append(row)
+    return np.array(rows, dtype=np.float64).reshape(-1, 16)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    "Row-wise normalize, zero-length rows stay zero like Vector3D.normalize."
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    safe_lengths = np.where(lengths == 0.0, 1.0, lengths)
+    return np.where(lengths == 0.0, 0.0, vectors / safe_lengths)
+
+
+def apply_view_transform(vertices: np.ndarray, view: PipelineView) -> np.ndarray:
+    basis = np.array(
+        (view.side_direction, view.up_direction, view.look_direction),
+        dtype=np.float64,
+    )
+    points = vertices - np.array(view.camera_position, dtype=np.float64)
+    return points @ basis.T
+
+
+def get_plane_distances(vertices: np.ndarray, plane: np.ndarray) -> np.ndarray:
+    return vertices @ plane[:3] + plane[3]
+
+
+def filter_outside_frustum(view_vertices: np.ndarray, view: PipelineView) -> np.ndarray:
+    "Mask of triangles with at least one vertex inside the frustum."
+    inside = np.ones(view_vertices.shape[:2], dtype=bool)
+    for plane in np.array(view.planes, dtype=np.float64):
+        inside &= get_plane_distances(view_vertices, plane) >= 0.0
+    return inside.any(axis=1)
+
+
+def get_normals(vertices: np.ndarray) -> np.ndarray:
+    edge1 = vertices[:, 1] - vertices[:, 0]
+    edge2 = vertices[:, 2] - vertices[:, 0]
+    return normalize_rows(np.cross(edge1, edge2))
+
+
+def get_pbr_shaders(
+    vertices: np.ndarray,
+    lights: np.ndarray,
+    viewer_position: np.ndarray,
+    material: PipelineMaterial,
+) -> np.ndarray:
+    """Vectorized Shaders.get_pbr_shader, broadcast over all lights and
+    triangles. Returns the shader vectors with shape (lights, triangles, 3)."""
+    light_positions = lights[:, np.newaxis, 0:3]
+    ambient_colors = lights[:, np.newaxis, 6:9]
+    diffuse_colors = lights[:, np.newaxis, 9:12]
+    specular_colors = lights[:, np.newaxis, 12:15]
+    lumens = lights[:, 15:16]
+    light_dirs = normalize_rows(lights[:, 3:6] - lights[:, 0:3])
+
+    centroids = vertices.sum(axis=1) / 3.0
+    normals = get_normals(vertices)
+    viewer_dirs = normalize_rows(viewer_position - centroids)
+
+    distance_vectors = centroids - light_positions
+    distances = np.linalg.norm(distance_vectors, axis=-1)
+    distance_vectors = normalize_rows(distance_vectors)
+
+    light_intensity = lumens / (distances**2)
+    projections = np.einsum("lnk,lk->ln", distance_vectors, light_dirs)
+    light_dirs = -projections[..., np.newaxis] * light_dirs[:, np.newaxis, :]
+    halfway = normalize_rows(light_dirs + viewer_dirs)
+
+    n_dot_l = np.maximum(0.0, np.einsum("nk,lnk->ln", normals, light_dirs))
+    n_dot_v = np.maximum(0.0, np.einsum("nk,nk->n", normals, viewer_dirs))
+    n_dot_h = np.maximum(0.0, np.einsum("nk,lnk->ln", normals, halfway))
+    diffuse_angle = n_dot_l
+
+    roughness_sq = material.roughness**2
+    g1_denom = n_dot_v + np.sqrt((1.0 - roughness_sq) * n_dot_v**2 + roughness_sq)
+    g2_denom = n_dot_l + np.sqrt((1.0 - roughness_sq) * n_dot_l**2 + roughness_sq)
+    g1 = 2.0 * n_dot_v / g1_denom
+    g2 = 2.0 * n_dot_l / g2_denom
+
+    attenuation = 1.0 / (
+        material.constant_attenuation
+        + material.linear_attenuation * distances
+        + material.quadratic_attenuation * distances**2
+    )
+
+    ambient = (lumens * light_intensity)[..., np.newaxis] * ambient_colors
+    diffuse_mult = diffuse_angle * lumens * attenuation * light_intensity
+    diffuse = diffuse_mult[..., np.newaxis] * diffuse_colors
+
+    d_denom = (n_dot_h**2 * (roughness_sq - 1.0) + 1.0) ** 2
+    f = material.f0 + (1.0 - material.f0) * (1.0 - n_dot_h) ** 5
+    d = roughness_sq / d_denom
+
+    specular_mult = f * g1 * g2 * d * light_intensity * attenuation
+    specular_mult /= 4.0 * n_dot_l * n_dot_v + 0.000001
+    specular = specular_mult[..., np.newaxis] * specular_colors
+
+    shader_vectors = (ambient + diffuse) * material.k_d + specular * material.k_s
+    return shader_vectors
+
+
+def apply_lighting(
+    vertices: np.ndarray,
+    shaders: np.ndarray,
+    lights: np.ndarray,
+    viewer_position: np.ndarray,
+    material: PipelineMaterial,
+) -> None:
+    """Averages every light into the shaders in place. Applying the lights
+    one after another halves the weight of all earlier ones, so of L
+    lights the k-th ends up weighted by 0.5 ** (L - k)."""
+    light_count = len(lights)
+    if not light_count or not len(vertices):
+        return
+
+    shader_vectors = get_pbr_shaders(vertices, lights, viewer_position, material)
+    weights = 0.5 ** np.arange(light_count, 0, -1, dtype=np.float64)
+    previous_weight = 0.5**light_count
+
+    shaders[:, :3] *= previous_weight
+    shaders[:, :3] += np.einsum("l,lnk->nk", weights, shader_vectors)
+    shaders[:, 3] = shaders[:, 3] * previous_weight + weights.sum()
+
+
+def get_intersections(
+    a: np.ndarray, b: np.ndarray, a_distances: np.ndarray, b_distances: np.ndarray
+) -> np.ndarray:
+    t = -a_distances / (b_distances - a_distances)
+    return a + (b - a) * t[:, np.newaxis]
+
+
+def clip_against_plane(
+    vertices: np.ndarray, sources: np.ndarray, plane: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized Frustum.clip_against_plane. A triangle with one vertex
+    inside becomes one triangle, with two vertices inside a quad that is
+    split into two triangles. Output keeps the order of the sources."""
+    distances = get_plane_distances(vertices, plane)
+    inside = distances >= 0.0
+    inside_count = inside.sum(axis=1)
+
+    if inside.all():
+        return vertices, sources
+
+    rows = np.arange(len(vertices))
+    kept = inside_count == 3
+    clipped_vertices = [vertices[kept]]
+    clipped_sources = [sources[kept]]
+
+    one = rows[inside_count == 1]
+    if len(one):
+        i = np.argmax(inside[one], axis=1)
+        j = (i + 1) % 3
+        k = (i + 2) % 3
+        vi, vj, vk = vertices[one, i], vertices[one, j], vertices[one, k]
+        di, dj, dk = distances[one, i], distances[one, j], distances[one, k]
+
+        c_ij = get_intersections(vi, vj, di, dj)
+        c_ki = get_intersections(vk, vi, dk, di)
+        clipped_vertices.append(np.stack((c_ij, c_ki, vi), axis=1))
+        clipped_sources.append(sources[one])
+
+    two = rows[inside_count == 2]
+    if len(two):
+        o = np.argmin(inside[two], axis=1)
+        j = (o + 1) % 3
+        k = (o + 2) % 3
+        vo, vj, vk = vertices[two, o], vertices[two, j], vertices[two, k]
+        do, dj, dk = distances[two, o], distances[two, j], distances[two, k]
+
+        c_oj = get_intersections(vo, vj, do, dj)
+        c_ko = get_intersections(vk, vo, dk, do)
+        clipped_vertices.append(np.stack((c_oj, vj, vk), axis=1))
+        clipped_vertices.append(np.stack((c_oj, vk, c_ko), axis=1))
+        clipped_sources.append(sources[two])
+        clipped_sources.append(sources[two])
+
+    clipped_vertices = np.concatenate(clipped_vertices)
+    clipped_sources = np.concatenate(clipped_sources)
+    order = np.argsort(clipped_sources, kind="stable")
+    return clipped_vertices[order], clipped_sources[order]
+
+
+def project_to_screen(view_vertices: np.ndarray, view: PipelineView) -> np.ndarray:
+    "Vectorized Camera.calculate_perspective_projection and ndc_to_screen_coordinates."
+    aspect_ratio = view.width / view.height
+    fov_rad = math.tan(math.radians(view.fov / 2))
+    zn = view.near_plane
+    zf = view.far_plane
+
+    x = view_vertices[..., 0]
+    y = view_vertices[..., 1]
+    z = view_vertices[..., 2]
+
+    xo = x * (1 / (fov_rad * aspect_ratio))
+    yo = y * (1 / fov_rad)
+    zo = z * -((zf - zn) / (zn - zf)) + ((2 * zf * zn) / (zn - zf))
+
+    divisor = np.where(z != 0.0, -z, 1.0)
+    screen_vertices = np.empty_like(view_vertices)
+    screen_vertices[..., 0] = (xo / divisor + 1.0) * (view.width / 2.0)
+    screen_vertices[..., 1] = (1.0 - yo / divisor) * (view.height / 2.0)
+    screen_vertices[..., 2] = zo / divisor
+    return screen_vertices
+
+
+def process_mesh(
+    vertices: np.ndarray,
+    shaders: np.ndarray,
+    colors: np.ndarray,
+    view: PipelineView,
+    lights: np.ndarray,
+    material: PipelineMaterial,
+) -> MeshResult:
+    """Frustum filter, z-sort, backface culling, lighting, clipping and
+    projection of one triangle mesh, the same stages DrawCall runs serially."""
+    camera_position = np.array(view.camera_position, dtype=np.float64)
+    indices = np.arange(len(vertices))
+
+    view_vertices = apply_view_transform(vertices, view)
+    indices = indices[filter_outside_frustum(view_vertices, view)]
+
+    centroids = vertices[indices].sum(axis=1) / 3.0
+    view_vectors = centroids - camera_position
+    distances = np.linalg.norm(view_vectors, axis=1)
+    order = np.argsort(-distances, kind="stable")
+    indices = indices[order]
+    view_vectors = view_vectors[order]
+
+    normals = get_normals(vertices[indices])
+    is_front_facing = np.einsum("ij,ij->i", normals, view_vectors) < 0.0
+    indices = indices[is_front_facing]
+
+    lit_vertices = vertices[indices]
+    lit_shaders = shaders[indices]
+    apply_lighting(lit_vertices, lit_shaders, lights, camera_position, material)
+    face_colors = get_face_colors(colors[indices], lit_shaders)
+
+    view_vertices = apply_view_transform(lit_vertices, view)
+    sources = np.arange(len(indices))
+    if view.enable_clipping:
+        for plane in np.array(view.planes, dtype=np.float64):
+            view_vertices, sources = clip_against_plane(view_vertices, sources, plane)
+
+    screen_vertices = project_to_screen(view_vertices, view)
+    return MeshResult(indices, lit_shaders, face_colors, screen_vertices, sources)
+
+
+def get_triangle_arrays(mesh: Mesh) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Screen vertices, indices and face colors of a projected mesh for
+    draw_triangles, quads are split into two triangles."""
+    rows = []
+    for polygon in mesh.polygons:
+        shape = polygon.shape
+        color = shape.color
+        shader = shape.shader
+        v0, v1, v2, *v3 = shape.vertices
+        row = (
+            v0.x, v0.y, v1.x, v1.y, v2.x, v2.y,
+            color.red, color.green, color.blue,
+            shader.red, shader.green, shader.blue,
+        )  # fmt: skip
+        rows.append(row)
+        if v3:
+            v3 = v3[0]
+            rows.append((v0.x, v0.y, v2.x, v2.y, v3.x, v3.y) + row[6:])
+
+    rows = np.array(rows, dtype=np.float64).reshape(-1, 12)
+    vertices = rows[:, 0:6].reshape(-1, 2)
+    indices = np.arange(len(vertices)).reshape(-1, 3)
+    colors = get_face_colors(rows[:, 6:9], rows[:, 9:12])
+    return vertices, indices, colors
+
+
+# Shared memory segment attached by this worker process.
+_segments: dict[str, SharedMemory] = {}
+
+
+def get_shared_array(segment_name: str, capacity: int) -> np.ndarray:
+    segment = _segments.get(segment_name)
+    if segment is None:
+        for previous_segment in _segments.values():
+            previous_segment.close()
+        _segments.clear()
+
+        segment = SharedMemory(name=segment_name)
+        _segments[segment_name] = segment
+
+    shape = (capacity, TRIANGLE_FLOATS)
+    return np.ndarray(shape, dtype=np.float64, buffer=segment.buf)
+
+
+def process_mesh_batch(
+    segment_name: str,
+    capacity: int,
+    ranges: list[tuple[int, int]],
+    view: PipelineView,
+    lights: np.ndarray,
+    material: PipelineMaterial,
+) -> list[MeshResult]:
+    "Worker entry point, runs the pipeline for the meshes at the given rows."
+    array = get_shared_array(segment_name, capacity)
+    results = []
+    for start, end in ranges:
+        vertices = array[start:end, 0:9].reshape(-1, 3, 3)
+        shaders = array[start:end, 9:13]
+        colors = array[start:end, 13:16]
+        result = process_mesh(vertices, shaders, colors, view, lights, material)
+        results.append(result)
+    return results
+
+
+class MeshPipelinePool:
+    """Runs the per-mesh stages for many meshes on a pool of processes.
+
+    Every frame the triangles of all meshes are packed into one shared
+    memory segment, so a task only pickles its row ranges, the view and
+    the lights. Workers return the screen-space triangles and the updated
+    shaders, which are written back on the render process. Meshes are
+    split into one contiguous batch per worker by triangle count."""
+
+    def __init__(self, workers: int, capacity: int = 65_536):
+        self.workers = workers
+        context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(workers, mp_context=context)
+        self.segment: Optional[SharedMemory] = None
+        self.capacity = 0
+        self.reserve(capacity)
+
+    def reserve(self, triangle_count: int) -> None:
+        if triangle_count <= self.capacity:
+            return
+
+        capacity = max(triangle_count, self.capacity * 2)
+        self.release_segment()
+        size = capacity * TRIANGLE_FLOATS * np.dtype(np.float64).itemsize
+        self.segment = SharedMemory(create=True, size=size)
+        self.capacity = capacity
+
+    def release_segment(self) -> None:
+        if self.segment:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+    @staticmethod
+    def supports(mesh: Mesh) -> bool:
+        return all(isinstance(polygon.shape, Triangle) for polygon in mesh.polygons)
+
+    def pack_meshes(self, meshes: list[Mesh]) -> list[tuple[int, int]]:
+        counts = [len(mesh.polygons) for mesh in meshes]
+        self.reserve(sum(counts))
+        shape = (self.capacity, TRIANGLE_FLOATS)
+        array = np.ndarray(shape, dtype=np.float64, buffer=self.segment.buf)
+
+        ranges = []
+        start = 0
+        for mesh, count in zip(meshes, counts):
+            rows = []
+            for polygon in mesh.polygons:
+                triangle = polygon.shape
+                v0, v1, v2 = triangle.vertices
+                shader = triangle.shader
+                color = triangle.color
+                row = (
+                    v0.x, v0.y, v0.z, v1.x, v1.y, v1.z, v2.x, v2.y, v2.z,
+                    shader.red, shader.green, shader.blue, shader.alpha,
+                    color.red, color.green, color.blue,
+                )  # fmt: skip
+                rows.append(row)
+
+            end = start + count
+            if rows:
+                array[start:end] = rows
+            ranges.append((start, end))
+            start = end
+        return ranges
+
+    def get_batches(self, ranges: list[tuple[int, int]]) -> list[list[tuple[int, int]]]:
+        total = ranges[-1][1] if ranges else 0
+        batch_size = max(total / self.workers, 1.0)
+        batches: list[list[tuple[int, int]]] = [[] for _ in range(self.workers)]
+
+        for start, end in ranges:
+            index = min(int(start / batch_size), self.workers - 1)
+            batches[index].append((start, end))
+        return [batch for batch in batches if batch]
+
+    def process(
+        self,
+        meshes: list[Mesh],
+        lights: list[Light],
+        view: PipelineView,
+        material: PipelineMaterial,
+    ) -> list[MeshResult]:
+        ranges = self.pack_meshes(meshes)
+        light_array = get_light_array(lights)
+
+        futures = []
+        for batch in self.get_batches(ranges):
+            future = self.executor.submit(
+                process_mesh_batch,
+                self.segment.name,
+                self.capacity,
+                batch,
+                view,
+                light_array,
+                material,
+            )
+            futures.append(future)
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    @staticmethod
+    def get_screen_triangles(
+        mesh: Mesh, result: MeshResult
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Writes the lit shaders back and returns the screen vertices,
+        indices and face colors of the projected triangles for draw_triangles."""
+        polygons = mesh.polygons
+        lit_indices = result.lit_indices.tolist()
+        lit_triangles = [polygons[index].shape for index in lit_indices]
+
+        for triangle, shader in zip(lit_triangles, result.shaders.tolist()):
+            triangle.shader = RGBA(*shader)
+
+        colors = result.colors[result.sources]
+        vertices = result.screen_vertices.reshape(-1, 3)
+        indices = np.arange(len(vertices)).reshape(-1, 3)
+        return vertices, indices, colors
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.release_segment()
@@ -0,0 +1,141 @@
+import numpy as np
+
+from abstracts.body_abc import Body
+from components.color import RGBA, WHITE
+from components.vertices import ParticleCircle
+from components.mesh_pipeline import (
+    PipelineView,
+    apply_view_transform,
+    get_plane_distances,
+    project_to_screen,
+)
+
+from typing import Optional
+
+
+class ParticleSystem(Body):
+    """Body made of many point particles stored as a structure of arrays.
+
+    Positions, velocities and accelerations are (N, 3) arrays and every
+    step integrates all particles at once, so the particle count is not
+    bound by the cost of one Physics object per particle. Particles are
+    drawn as circles whose radius is their size in world units.
+
+    A step assigns new arrays instead of writing into the old ones, so a
+    pair of arrays taken together after a step stays complete. In pipelined
+    mode the worker publishes that pair in the PhysicsSnapshot and the
+    renderer reads it from there instead of from the live system."""
+
+    def __init__(
+        self,
+        positions: np.ndarray,
+        sizes: Optional[np.ndarray] = None,
+        color: RGBA = WHITE,
+    ):
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self.previous_positions = self.positions
+        self.velocities = np.zeros_like(self.positions)
+        self.accelerations = np.zeros_like(self.positions)
+        if sizes is None:
+            sizes = np.ones(len(self.positions))
+        self.sizes = np.array(sizes, dtype=np.float64)
+        self.color = color
+        self.g_const = 0.1
+
+    @classmethod
+    def from_particle_circle(
+        cls,
+        particle_circle: ParticleCircle,
+        px: float,
+        py: float,
+        pz: float,
+        color: RGBA = WHITE,
+    ) -> "ParticleSystem":
+        "Seeds the system with the rings of a ParticleCircle in the z = pz plane."
+        particles = np.array(particle_circle.generate(px, py), dtype=np.float64)
+        particles = particles.reshape(-1, 3)
+        positions = np.empty((len(particles), 3))
+        positions[:, 0:2] = particles[:, 0:2]
+        positions[:, 2] = pz
+        return cls(positions, particles[:, 2], color)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def set_color(self, color: RGBA) -> None:
+        self.color = color
+
+    def set_velocity(self, x: float, y: float, z: float) -> None:
+        self.velocities = np.tile((x, y, z), (len(self), 1)).astype(np.float64)
+
+    def set_orbital_velocity(self, center: tuple[float, float, float], speed: float):
+        "Sets every particle moving around the z axis through `center`."
+        offsets = self.positions - np.array(center, dtype=np.float64)
+        tangents = np.stack((-offsets[:, 1], offsets[:, 0], np.zeros(len(self))), 1)
+        lengths = np.linalg.norm(tangents, axis=1, keepdims=True)
+        lengths[lengths == 0.0] = 1.0
+        self.velocities = tangents / lengths * speed
+
+    def apply_attraction(self, positions: np.ndarray, masses: np.ndarray) -> None:
+        "Accelerates all particles towards bodies at `positions` with `masses`."
+        for position, mass in zip(positions, masses):
+            distance_vectors = position - self.positions
+            distances_sq = np.einsum("ij,ij->i", distance_vectors, distance_vectors)
+            distances = np.sqrt(distances_sq)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                strength = np.where(
+                    distances > 0.0,
+                    self.g_const * mass / (distances_sq * distances),
+                    0.0,
+                )
+            self.accelerations = (
+                self.accelerations + distance_vectors * strength[:, None]
+            )
+
+    def update(self, timestep: float) -> None:
+        "Same integration as Physics._calculate_position, for all particles."
+        velocity_change = self.accelerations * timestep
+        position_change = self.velocities * timestep
+        position_change += self.accelerations * (0.5 * timestep**2)
+
+        self.previous_positions = self.positions
+        self.positions = self.positions + position_change
+        self.velocities = self.velocities + velocity_change
+        self.accelerations = np.zeros_like(self.positions)
+
+    @staticmethod
+    def interpolate_positions(
+        previous_positions: np.ndarray, positions: np.ndarray, alpha: float
+    ) -> np.ndarray:
+        if previous_positions is positions or alpha >= 1.0:
+            return positions
+        return previous_positions + (positions - previous_positions) * alpha
+
+    def get_render_positions(self, alpha: float) -> np.ndarray:
+        return self.interpolate_positions(
+            self.previous_positions, self.positions, alpha
+        )
+
+    def get_screen_particles(
+        self, view: PipelineView, render_positions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the screen positions and radii of the particles at
+        `render_positions` that are inside the frustum, ordered from the
+        farthest to the nearest."""
+        view_positions = apply_view_transform(render_positions, view)
+
+        inside = np.ones(len(view_positions), dtype=bool)
+        for plane in np.array(view.planes, dtype=np.float64):
+            inside &= get_plane_distances(view_positions, plane) >= 0.0
+        view_positions = view_positions[inside]
+        sizes = self.sizes[inside]
+
+        depths = view_positions[:, 2]
+        order = np.argsort(-depths, kind="stable")
+        view_positions = view_positions[order]
+        depths = depths[order]
+
+        screen_positions = project_to_screen(view_positions, view)
+        focal_length = (view.height / 2.0) / np.tan(np.radians(view.fov / 2.0))
+        radii = np.maximum(sizes[order] * focal_length / depths, 1.0)
+        return screen_positions[:, 0:2], radii
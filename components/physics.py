@@ -15,6 +15,8 @@ class Physics:
     def __init__(self, mesh: Mesh):
         self.mesh = mesh
         self.position = Vector3D(0.0, 0.0, 0.0)
+        self.previous_position = self.position
+        self.mesh_position = self.position
         self.velocity = Vector3D(0.0, 0.0, 0.0)
         self.acceleration = Vector3D(0.0, 0.0, 0.0)
         self.spin_velocity = Vector3D(0.0, 0.0, 0.0)
@@ -25,6 +27,9 @@ class Physics:
         self.mass = 1.0
         self.scale = 1.0
         self.g_const = 0.1
+        self.is_sleeping = False
+        self.rest_steps = 0
+        self.local_bounds = self.get_local_bounds()
 
     @staticmethod
     def _rotate_x(xyz_point: Vector3D, theta: float) -> Vector3D:
@@ -65,59 +70,6 @@ class Physics:
         self.position = self.position.add_vector(timestep_acceleration)
         self.velocity = self.velocity.add_vector(self.acceleration.multiply(timestep))
 
-        if self.mesh.light:
-            light_position = self.mesh.light.position
-            light_position = light_position.add_vector(timestep_velocity)
-            self.mesh.light.position = light_position
-
-        for polygon in self.mesh.original_polygons:
-            if isinstance(polygon.shape, Triangle):
-                v1 = polygon.shape.vertices[0]
-                v2 = polygon.shape.vertices[1]
-                v3 = polygon.shape.vertices[2]
-
-                v1 = v1.add_vector(timestep_velocity)
-                v2 = v2.add_vector(timestep_velocity)
-                v3 = v3.add_vector(timestep_velocity)
-
-                vertices = (v1, v2, v3)
-                polygon.shape.vertices = vertices
-
-            elif isinstance(polygon.shape, Quad):
-                v1 = polygon.shape.vertices[0]
-                v2 = polygon.shape.vertices[1]
-                v3 = polygon.shape.vertices[2]
-                v4 = polygon.shape.vertices[3]
-
-                v1 = v1.add_vector(timestep_velocity)
-                v2 = v2.add_vector(timestep_velocity)
-                v3 = v3.add_vector(timestep_velocity)
-                v4 = v4.add_vector(timestep_velocity)
-
-                vertices = (v1, v2, v3, v4)
-                polygon.shape.vertices = vertices
-
-    def _calculate_spin(self, timestep: float):
-        timestep_velocity = self.spin_velocity.multiply(timestep)
-        timestep_acceleration = self.spin_acceleration.multiply(timestep)
-        self.spin_velocity = self.spin_velocity.add_vector(timestep_acceleration)
-
-        x_rotation = timestep_velocity.x * timestep
-        y_rotation = timestep_velocity.y * timestep
-        z_rotation = timestep_velocity.z * timestep
-
-        for polygon in self.mesh.original_polygons:
-            vertices = list(polygon.shape.vertices)
-            for idx, vertex in enumerate(vertices):
-                vertex = self._rotate_x(vertex, x_rotation)
-                vertex = self._rotate_y(vertex, y_rotation)
-                vertex = self._rotate_z(vertex, z_rotation)
-                if self.mesh.light:
-                    self.mesh.light.position = vertex
-                vertices[idx] = vertex
-
-            polygon.shape.vertices = tuple(vertices)
-
     def get_random_direction(self):
         x_rnd = random.uniform(-1.0, 1.0)
         y_rnd = random.uniform(-1.0, 1.0)
@@ -125,16 +77,25 @@ class Physics:
         return direction
 
     def set_position(self, x: float, y: float, z: float):
-        self.position = Vector3D(x, y, z)
+        position = Vector3D(x, y, z)
+        # The mesh stays where it is and is now taken to sit at `position`.
+        shift = self.mesh_position.subtract_vector(position).to_tuple() * 2
+        self.local_bounds = tuple(b + s for b, s in zip(self.local_bounds, shift))
+        self.position = position
+        self.previous_position = self.position
+        self.mesh_position = self.position
+        self.wake()
 
     def set_velocity(self, x: float, y: float, z: float):
         self.velocity = Vector3D(x, y, z)
+        self.wake()
 
     def set_spin_velocity(self, x: float, y: float, z: float):
         self.spin_velocity = Vector3D(x, y, z)
 
     def set_acceleration(self, x: float, y: float, z: float):
         self.acceleration = Vector3D(x, y, z)
+        self.wake()
 
     def set_mass(self, mass: float):
         self.mass = mass
@@ -275,6 +236,55 @@ class Physics:
             # properties_args = (target, self_shifted, target_shifted, stt_direction)
             # collision_properties = self.create_collision_properties(*properties_args)
 
+    def get_interpolated_position(self, alpha: float) -> Vector3D:
+        "Position between the last two physics steps, alpha being in [0, 1]."
+        return self.previous_position.lerp_interpolation(self.position, alpha)
+
+    def sync_mesh(self, alpha: float = 1.0) -> None:
+        "Moves the mesh and its light to the interpolated render position."
+        render_position = self.get_interpolated_position(alpha)
+        self.move_mesh(render_position)
+
+    def move_mesh(self, render_position: Vector3D) -> None:
+        offset = render_position.subtract_vector(self.mesh_position)
+        if offset.get_length_squared() == 0.0:
+            return
+
+        self.mesh.translate(offset)
+        if self.mesh.light:
+            light_position = self.mesh.light.position
+            self.mesh.light.position = light_position.add_vector(offset)
+        self.mesh_position = render_position
+
+    def set_state(self, position: Vector3D, velocity: Vector3D) -> None:
+        "Applies a step computed elsewhere, e.g. by an integrator."
+        self.previous_position = self.position
+        self.position = position
+        self.velocity = velocity
+        self.acceleration = Vector3D(0.0, 0.0, 0.0)
+
+    def sleep(self) -> None:
+        "Stops the body in place, it is skipped by the integrator until woken."
+        self.is_sleeping = True
+        self.previous_position = self.position
+        self.velocity = Vector3D(0.0, 0.0, 0.0)
+
+    def wake(self) -> None:
+        self.is_sleeping = False
+        self.rest_steps = 0
+
+    def get_local_bounds(self) -> tuple[float, ...]:
+        """Corners of the axis-aligned box around the mesh relative to the
+        body, as (min_x, min_y, min_z, max_x, max_y, max_z).
+
+        Read from the mesh once at setup, afterwards the box only follows
+        the body so the physics step never reads mesh data."""
+        box_min, box_max = self.mesh.get_bounding_box()
+        box_min = box_min.subtract_vector(self.mesh_position)
+        box_max = box_max.subtract_vector(self.mesh_position)
+        return box_min.to_tuple() + box_max.to_tuple()
+
     def update(self, timestep: float):
+        self.previous_position = self.position
         self._calculate_position(timestep)
         self.acceleration = Vector3D(0.0, 0.0, 0.0)
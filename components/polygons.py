@@ -1,18 +1,19 @@
 from components.vectors import Vector3D
-from components.color import RGBA
+from components.color import RGBA, UNLIT, WHITE
 from components.light import Light
 
 from typing import Union, Optional
-from copy import deepcopy
 
 
 class Triangle:
+    __slots__ = ("vertices", "face", "shader", "color")
+
     def __init__(
         self,
         vertices: tuple[Vector3D, Vector3D, Vector3D],
         face: tuple[int, int, int],
-        shader: RGBA = RGBA(0.0, 0.0, 0.0, 0.0),
-        color: RGBA = RGBA(1.0, 1.0, 1.0, 1.0),
+        shader: RGBA = UNLIT,
+        color: RGBA = WHITE,
     ):
         self.vertices = vertices
         self.face = face
@@ -21,12 +22,14 @@ class Triangle:
 
 
 class Quad:
+    __slots__ = ("vertices", "face", "shader", "color")
+
     def __init__(
         self,
         vertices: tuple[Vector3D, Vector3D, Vector3D, Vector3D],
         face: tuple[int, int, int, int],
-        shader: RGBA = RGBA(0.0, 0.0, 0.0, 0.0),
-        color: RGBA = RGBA(1.0, 1.0, 1.0, 1.0),
+        shader: RGBA = UNLIT,
+        color: RGBA = WHITE,
     ) -> None:
         self.vertices = vertices
         self.face = face
@@ -35,6 +38,8 @@ class Quad:
 
 
 class Polygon:
+    __slots__ = ("shape",)
+
     def __init__(self, shape: Union[Triangle, Quad]):
         self.shape = shape
 
@@ -62,10 +67,81 @@ class Polygon:
 
 
 class Mesh:
+    """Polygons moved and lit as one object.
+
+    The mesh takes ownership of the Polygon objects it is given, they are
+    not copied. Meshes built from the polygons of another mesh share them,
+    so a translation or a shader update shows up in both."""
+
     def __init__(self, polygons: list[Polygon], light: Optional[Light] = None) -> None:
-        self.original_polygons = deepcopy(polygons)
+        self.original_polygons = list(polygons)
         self.polygons = polygons
         self.light = light
+        self.lods: list[Mesh] = []
+        self.lod_error = 0.0
+        self.bounds: Optional[tuple[Vector3D, float]] = None
+
+    def translate(self, vector: Vector3D) -> None:
+        for polygon in self.original_polygons:
+            shape = polygon.shape
+            shape.vertices = tuple(
+                vertex.add_vector(vector) for vertex in shape.vertices
+            )
+
+        for lod in self.lods:
+            lod.translate(vector)
+
+        if self.bounds:
+            center, radius = self.bounds
+            self.bounds = (center.add_vector(vector), radius)
+
+    def reset_bounds(self) -> None:
+        self.bounds = None
+        for lod in self.lods:
+            lod.reset_bounds()
+
+    def get_polygon_count(self) -> int:
+        return len(self.original_polygons)
+
+    def get_bounding_box(self) -> tuple[Vector3D, Vector3D]:
+        "Minimum and maximum corners of the axis-aligned box around the mesh."
+        vertices = [v for p in self.original_polygons for v in p.shape.vertices]
+        if not vertices:
+            return Vector3D(0.0, 0.0, 0.0), Vector3D(0.0, 0.0, 0.0)
+
+        min_x = min(vertex.x for vertex in vertices)
+        min_y = min(vertex.y for vertex in vertices)
+        min_z = min(vertex.z for vertex in vertices)
+        max_x = max(vertex.x for vertex in vertices)
+        max_y = max(vertex.y for vertex in vertices)
+        max_z = max(vertex.z for vertex in vertices)
+        return Vector3D(min_x, min_y, min_z), Vector3D(max_x, max_y, max_z)
+
+    def get_bounding_sphere(self) -> tuple[Vector3D, float]:
+        if self.bounds:
+            return self.bounds
+
+        vertices = [v for p in self.original_polygons for v in p.shape.vertices]
+        if not vertices:
+            return Vector3D(0.0, 0.0, 0.0), 0.0
+
+        center_min, center_max = self.get_bounding_box()
+        center = center_min.get_midpoint(center_max)
+        radius = max(center.get_distance(vertex) for vertex in vertices)
+
+        self.bounds = (center, radius)
+        return self.bounds
+
+    def get_lod(self, level: int) -> "Mesh":
+        if level <= 0 or not self.lods:
+            return self
+        return self.lods[min(level, len(self.lods)) - 1]
+
+    def get_world_polygons(self, level: int = 0) -> list[Polygon]:
+        return list(self.get_lod(level).original_polygons)
+
+    def release_world_polygons(self) -> None:
+        pass
 
     def get_axes(self) -> list[Vector3D]:
         axes = []
@@ -101,3 +177,94 @@ class Mesh:
                 return False
 
         return True
+
+
+class InstancedMesh(Mesh):
+    """Mesh that references shared asset geometry and renders it
+    with its own offset and color.
+
+    World-space polygons are built on demand for each frame, so only
+    the per-face shader state is stored per instance. There is no
+    original_polygons list to edit in place: the geometry belongs to the
+    asset, build_world_polygons makes a throwaway world-space copy."""
+
+    def __init__(
+        self,
+        asset: Mesh,
+        offset: Vector3D,
+        color: Optional[RGBA] = None,
+        light: Optional[Light] = None,
+    ) -> None:
+        self.asset = asset
+        self.offset = offset
+        self.color = color
+        self.light = light
+        self.polygons: list[Polygon] = []
+        self.shaders: dict[int, list[RGBA]] = {}
+        self.world_polygons: list[Polygon] = []
+        self.world_level = 0
+
+    @property
+    def original_polygons(self) -> list[Polygon]:
+        raise AttributeError(
+            "InstancedMesh shares its asset geometry, use build_world_polygons() "
+            "for a world-space copy or edit the asset"
+        )
+
+    @property
+    def lods(self) -> list[Mesh]:
+        return self.asset.lods
+
+    def translate(self, vector: Vector3D) -> None:
+        self.offset = self.offset.add_vector(vector)
+
+    def reset_bounds(self) -> None:
+        pass
+
+    def get_polygon_count(self) -> int:
+        return self.asset.get_polygon_count()
+
+    def get_bounding_box(self) -> tuple[Vector3D, Vector3D]:
+        box_min, box_max = self.asset.get_bounding_box()
+        return box_min.add_vector(self.offset), box_max.add_vector(self.offset)
+
+    def get_bounding_sphere(self) -> tuple[Vector3D, float]:
+        center, radius = self.asset.get_bounding_sphere()
+        return center.add_vector(self.offset), radius
+
+    def build_world_polygons(self, level: int = 0) -> list[Polygon]:
+        "New world-space polygons of a level, carrying this instance's shaders."
+        level = min(max(level, 0), len(self.asset.lods))
+        asset = self.asset.get_lod(level)
+        if level in self.shaders:
+            shaders = self.shaders[level]
+        else:
+            shaders = [polygon.shape.shader for polygon in asset.original_polygons]
+        offset = self.offset
+        polygons = []
+
+        for polygon, shader in zip(asset.original_polygons, shaders):
+            shape = polygon.shape
+            vertices = tuple(vertex.add_vector(offset) for vertex in shape.vertices)
+            color = self.color if self.color else shape.color
+
+            if isinstance(shape, Triangle):
+                world_shape = Triangle(vertices, shape.face, shader, color)
+            else:
+                world_shape = Quad(vertices, shape.face, shader, color)
+            polygons.append(Polygon(world_shape))
+        return polygons
+
+    def get_world_polygons(self, level: int = 0) -> list[Polygon]:
+        self.world_level = min(max(level, 0), len(self.asset.lods))
+        self.world_polygons = self.build_world_polygons(self.world_level)
+        return list(self.world_polygons)
+
+    def release_world_polygons(self) -> None:
+        "Keep the shaders computed this frame and drop the world polygons."
+        if not self.world_polygons:
+            return
+
+        shaders = [polygon.shape.shader for polygon in self.world_polygons]
+        self.shaders[self.world_level] = shaders
+        self.world_polygons = []
@@ -0,0 +1,150 @@
+import time
+from collections import deque
+
+from shared_dcs import StageTime
+from components.tracer import ChromeTracer
+
+from typing import Optional
+
+
+class StageTimer:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "StageTimer":
+        self.profiler.begin(self.name)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.end()
+
+
+class NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "NullTimer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class FrameProfiler:
+    """Hierarchical per-stage frame timer.
+
+    Stages nest through `with profiler.stage(name):` blocks, are keyed by
+    their path (e.g. "draw/lighting") and are reported in the order they
+    are first entered. Time spent in a stage is summed over a frame, the
+    per-frame totals of the last `sample_count` frames give the percentiles.
+
+    The same stages are forwarded to the tracer while tracing is enabled."""
+
+    def __init__(
+        self,
+        sample_count: int = 240,
+        report_interval: int = 30,
+        tracer: Optional[ChromeTracer] = None,
+    ):
+        self.enabled = False
+        self.tracer = tracer if tracer else ChromeTracer()
+        self.sample_count = sample_count
+        self.report_interval = report_interval
+        self.samples: dict[str, deque[float]] = {}
+        self.frame_totals: dict[str, float] = {}
+        self.stack: list[tuple[str, float]] = []
+        self.timers: dict[str, StageTimer] = {}
+        self.null_timer = NullTimer()
+        self.stage_times: list[StageTime] = []
+        self.frames_since_report = 0
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self.reset()
+        print("FRAME PROFILER:", self.enabled)
+
+    def reset(self) -> None:
+        self.samples = {}
+        self.frame_totals = {}
+        self.stack = []
+        self.stage_times = []
+        self.frames_since_report = 0
+
+    def stage(self, name: str):
+        if not (self.enabled or self.tracer.enabled):
+            return self.null_timer
+
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = StageTimer(self, name)
+            self.timers[name] = timer
+        return timer
+
+    def begin(self, name: str) -> None:
+        if self.stack:
+            name = f"{self.stack[-1][0]}/{name}"
+        self.frame_totals.setdefault(name, 0.0)
+        self.stack.append((name, time.perf_counter()))
+
+    def end(self) -> None:
+        if not self.stack:
+            return
+
+        name, start = self.stack.pop()
+        elapsed = time.perf_counter() - start
+        if self.enabled:
+            self.frame_totals[name] += elapsed
+
+        if self.tracer.enabled:
+            category, _, stage_name = name.rpartition("/")
+            self.tracer.add_event(stage_name, category or "frame", start, elapsed)
+
+    def record(self, name: str, elapsed: float) -> None:
+        "Records a stage that was timed elsewhere and ended just now."
+        if self.enabled:
+            self.frame_totals[name] = self.frame_totals.get(name, 0.0) + elapsed
+
+        if self.tracer.enabled:
+            start = time.perf_counter() - elapsed
+            self.tracer.add_event(name, "frame", start, elapsed)
+
+    def tick(self) -> None:
+        "Closes the current frame, called once per frame by the frame timer."
+        if not self.enabled:
+            return
+
+        frame_totals = self.frame_totals
+        self.frame_totals = {}
+        for name, elapsed in frame_totals.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.sample_count)
+            self.samples[name].append(elapsed)
+
+        self.frames_since_report += 1
+        if self.frames_since_report >= self.report_interval:
+            self.stage_times = self.get_stage_times()
+            self.frames_since_report = 0
+
+    @staticmethod
+    def get_percentile(sorted_samples: list[float], percentile: float) -> float:
+        index = round((percentile / 100.0) * (len(sorted_samples) - 1))
+        return sorted_samples[index]
+
+    def get_stage_times(self) -> list[StageTime]:
+        stage_times = []
+        for name in self.samples:
+            sorted_samples = sorted(self.samples[name])
+            if not sorted_samples:
+                continue
+
+            stage_time = StageTime(
+                name=name,
+                depth=name.count("/"),
+                p50=self.get_percentile(sorted_samples, 50.0) * 1000.0,
+                p95=self.get_percentile(sorted_samples, 95.0) * 1000.0,
+                p99=self.get_percentile(sorted_samples, 99.0) * 1000.0,
+            )
+            stage_times.append(stage_time)
+        return stage_times
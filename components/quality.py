@@ -0,0 +1,118 @@
+from collections import deque
+
+from shared_dcs import QualityLevel
+
+QUALITY_LEVELS = (
+    QualityLevel("high", max_error_px=2.0, far_plane=float("inf"), lighting_interval=1),
+    QualityLevel("medium", max_error_px=4.0, far_plane=20_000.0, lighting_interval=1),
+    QualityLevel("low", max_error_px=8.0, far_plane=10_000.0, lighting_interval=2),
+    QualityLevel("lowest", max_error_px=16.0, far_plane=5_000.0, lighting_interval=4),
+)
+
+
+class QualityScaler:
+    """Steps through the quality levels to hold a target frame time.
+
+    The busy time of the frame, without the wait for the frame cap, is
+    averaged over `window` frames. Quality drops one level when the average
+    is over the target and rises one level when it is under `raise_ratio`
+    of the target, the window restarts after every change so a level is
+    always judged on its own frames."""
+
+    def __init__(
+        self,
+        target_frame_time: float,
+        levels: tuple[QualityLevel, ...] = QUALITY_LEVELS,
+        window: int = 15,
+        raise_ratio: float = 0.7,
+    ):
+        self.target_frame_time = target_frame_time
+        self.levels = levels
+        self.raise_ratio = raise_ratio
+        self.frame_times: deque[float] = deque(maxlen=window)
+        self.level_index = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+
+    def get_average_frame_time(self) -> float:
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def update(self, busy_time: float) -> bool:
+        "Records the busy time of a frame, returns True when the level changed."
+        self.frame_times.append(busy_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = self.get_average_frame_time()
+        if average > self.target_frame_time:
+            level_index = min(self.level_index + 1, len(self.levels) - 1)
+        elif average < self.target_frame_time * self.raise_ratio:
+            level_index = max(self.level_index - 1, 0)
+        else:
+            level_index = self.level_index
+
+        if level_index == self.level_index:
+            return False
+
+        self.level_index = level_index
+        self.frame_times.clear()
+        return True
+
+
+class RenderScaler:
+    """Adjusts the render scale of the scene to hold a target frame time.
+
+    Fill cost follows the pixel count, the square of the scale, so after
+    every `window` frames the scale moves by the square root of the target
+    over the average busy time. Changes are limited to `max_step` and
+    rounded to `resolution`, and averages within `tolerance` of the target
+    keep the current scale, so the offscreen surface is rarely rebuilt."""
+
+    def __init__(
+        self,
+        target_frame_time: float,
+        min_scale: float = 0.5,
+        max_scale: float = 1.0,
+        window: int = 15,
+        tolerance: float = 0.15,
+        max_step: float = 0.1,
+        resolution: float = 0.05,
+    ):
+        self.target_frame_time = target_frame_time
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.tolerance = tolerance
+        self.max_step = max_step
+        self.resolution = resolution
+        self.frame_times: deque[float] = deque(maxlen=window)
+        self.scale = max_scale
+
+    def get_scale(self, average: float) -> float:
+        target = self.target_frame_time
+        if abs(average - target) <= target * self.tolerance:
+            return self.scale
+
+        scale = self.scale * (target / average) ** 0.5
+        step = max(-self.max_step, min(scale - self.scale, self.max_step))
+        scale = round((self.scale + step) / self.resolution) * self.resolution
+        scale = round(scale, 6)
+        return max(self.min_scale, min(scale, self.max_scale))
+
+    def update(self, busy_time: float) -> bool:
+        "Records the busy time of a frame, returns True when the scale changed."
+        self.frame_times.append(busy_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        scale = self.get_scale(average)
+        self.frame_times.clear()
+        if scale == self.scale:
+            return False
+
+        self.scale = scale
+        return True
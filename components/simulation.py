@@ -1,14 +1,26 @@
 import random
+from functools import partial
 
+import numpy as np
+
+from abstracts.body_abc import Body
 from abstracts.graphics_abc import GraphicsABC
 from components.color import RGBA
 from components.physics import Physics
 from components.font import FontSettings, ArialFontNormal, ArialFontBold
 from components.text_writer import TextWriter
 from components.draw_call import DrawCall
+from components.timestep import FixedTimestep
+from components.gravity import DirectGravity
+from components.integrators import INTEGRATORS, EnergyMonitor, get_integrator
+from components.sleep import SleepSystem
+from components.quality import QualityScaler
+from components.vectors import Vector3D
+from components.physics_worker import PhysicsWorker
 from shared_dcs import FrameTime
 
 from pathlib import Path
+from typing import Callable, Optional
 
 import configurations.body_configurations as body_configurations
 
@@ -17,7 +29,17 @@ class Simulation:
     def __init__(self, draw_call: DrawCall) -> None:
         self.draw_call = draw_call
         self.text_writer = self.create_text_writer()
-        self.timestep_hz = 1
+        self.hud_update_hz = 4.0
+        self.timestep_hz = 120
+        self.fixed_timestep = FixedTimestep(1.0 / self.timestep_hz)
+        self.enable_gravity = False
+        self.gravity = DirectGravity(softening=10.0)
+        self.integrator = get_integrator("verlet")
+        self.energy_monitor = EnergyMonitor()
+        self.sleep_system = SleepSystem()
+        self.body_accelerations = np.zeros((0, 3))
+        self.physics_worker: Optional[PhysicsWorker] = None
+        self.quality_scaler: Optional[QualityScaler] = None
 
     @staticmethod
     def get_header_font():
@@ -52,9 +74,87 @@ class Simulation:
         text_writer = TextWriter(font)
         return text_writer
 
+    def change_physics(self, change: Callable[[], None]):
+        """Physics state is only changed between steps. In pipelined mode
+        the change is queued and applied by the worker before its next step."""
+        if self.physics_worker:
+            self.physics_worker.submit(change)
+        else:
+            change()
+
     def increment_timestep(self, increment: int):
+        self.change_physics(partial(self.apply_timestep_increment, increment))
+
+    def apply_timestep_increment(self, increment: int):
         if (self.timestep_hz + increment) > 1:
             self.timestep_hz += increment
+            self.fixed_timestep.set_timestep(1.0 / self.timestep_hz)
+
+    def set_pipelined(self, enabled: bool):
+        if enabled and not self.physics_worker:
+            self.physics_worker = PhysicsWorker(
+                self.draw_call.objects,
+                self.draw_call.particle_systems,
+                self.step_physics,
+                self.fixed_timestep,
+                self.update_energy,
+            )
+        elif not enabled and self.physics_worker:
+            self.physics_worker.stop()
+            self.physics_worker = None
+            self.draw_call.physics_snapshot = None
+
+    def toggle_pipelined(self):
+        self.set_pipelined(not self.physics_worker)
+        print("PIPELINED PHYSICS:", bool(self.physics_worker))
+
+    def toggle_gravity(self):
+        self.change_physics(self.apply_gravity_toggle)
+
+    def apply_gravity_toggle(self):
+        self.enable_gravity = not self.enable_gravity
+        self.integrator.reset()
+        self.energy_monitor.reset()
+        print("GRAVITY:", self.enable_gravity)
+
+    def toggle_sleeping(self):
+        self.change_physics(self.apply_sleeping_toggle)
+
+    def apply_sleeping_toggle(self):
+        self.sleep_system.enabled = not self.sleep_system.enabled
+        if not self.sleep_system.enabled:
+            self.sleep_system.wake_all(self.draw_call.objects)
+        print("SLEEPING:", self.sleep_system.enabled)
+
+    def set_integrator(self, name: str):
+        self.change_physics(partial(self.apply_integrator, name))
+
+    def apply_integrator(self, name: str):
+        self.integrator = get_integrator(name)
+        self.energy_monitor.reset()
+
+    def cycle_integrator(self):
+        self.change_physics(self.apply_integrator_cycle)
+
+    def apply_integrator_cycle(self):
+        names = list(INTEGRATORS)
+        index = names.index(self.integrator.name)
+        self.apply_integrator(names[(index + 1) % len(names)])
+        print("INTEGRATOR:", self.integrator.name)
+
+    def set_target_frame_time(self, target_frame_time: Optional[float]):
+        "Scales the render quality to hold the target, None keeps the current level."
+        if target_frame_time is None:
+            self.quality_scaler = None
+        else:
+            self.quality_scaler = QualityScaler(target_frame_time)
+            self.draw_call.set_quality(self.quality_scaler.level)
+
+    def update_quality(self, busy_time: float):
+        scaler = self.quality_scaler
+        if scaler and scaler.update(busy_time):
+            self.draw_call.set_quality(scaler.level)
+            print("QUALITY:", scaler.level.name)
 
     def setup_objects_cubes(self):
         for _ in range(10):
@@ -89,6 +189,9 @@ class Simulation:
         # obj = body_configurations.get_obj2()
         # self.draw_call.add_object(obj)
 
+        # particles = body_configurations.get_particle_disk()
+        # self.draw_call.add_object(particles)
+
     def handle_physics(
         self, obj1_physics: Physics, obj2_physics: Physics, idx1: int, idx2: int
     ):
@@ -111,20 +214,137 @@ class Simulation:
         #             obj2_physics.mass += obj1_physics.mass
         #             continue
 
-    def compute_all_objects(self):
-        # objects = self.draw_call.objects
-        # timestep = 1.0 / self.timestep_hz
-
-        # for obj1 in objects:
-        #     obj1_physics = obj1.physics
-        #     for obj2 in objects:
-        #         if obj1 == obj2:
-        #             continue
-        #         obj2_physics = obj2.physics
-        #         obj1_physics.apply_forces(obj2_physics, timestep)
-        #     obj1_physics.update(timestep)
+    def get_body_arrays(
+        self, bodies: list[Body]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        positions = [body.physics.position.to_tuple() for body in bodies]
+        velocities = [body.physics.velocity.to_tuple() for body in bodies]
+        masses = [body.physics.mass for body in bodies]
+
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        velocities = np.array(velocities, dtype=np.float64).reshape(-1, 3)
+        masses = np.array(masses, dtype=np.float64)
+        return positions, velocities, masses
+
+    def get_accelerations(
+        self,
+        positions: np.ndarray,
+        masses: np.ndarray,
+        external_accelerations: np.ndarray,
+    ) -> np.ndarray:
+        if self.enable_gravity and len(positions) > 1:
+            accelerations = self.gravity.get_accelerations(positions, masses)
+            return accelerations + external_accelerations
+        return external_accelerations
+
+    def get_total_energy(self) -> float:
+        objects = self.draw_call.objects
+        positions, velocities, masses = self.get_body_arrays(objects)
+        energy = 0.5 * float(np.sum(masses * np.sum(velocities**2, axis=1)))
+        if self.enable_gravity:
+            energy += self.gravity.get_potential_energy(positions, masses)
+        return energy
+
+    def update_energy(self):
+        self.energy_monitor.update(self.get_total_energy())
+
+    def apply_particle_gravity(self, positions: np.ndarray, masses: np.ndarray):
+        for particle_system in self.draw_call.particle_systems:
+            particle_system.apply_attraction(positions, masses)
+
+    def get_awake_accelerations(
+        self,
+        awake_positions: np.ndarray,
+        positions: np.ndarray,
+        awake: np.ndarray,
+        masses: np.ndarray,
+        external_accelerations: np.ndarray,
+    ) -> np.ndarray:
+        "Accelerations of the awake bodies, sleeping bodies stay at `positions`."
+        positions = positions.copy()
+        positions[awake] = awake_positions
+        accelerations = self.get_accelerations(
+            positions, masses, external_accelerations
+        )
+        self.body_accelerations = accelerations
+        return accelerations[awake]
+
+    def step_bodies(self, timestep: float):
+        objects = self.draw_call.objects
+        awake = self.sleep_system.wake_touched(objects)
+        if not self.enable_gravity:
+            # Without gravity sleeping bodies neither move nor pull.
+            objects = [
+                obj for obj, is_awake in zip(objects, awake.tolist()) if is_awake
+            ]
+            awake = np.ones(len(objects), dtype=bool)
+            if not objects:
+                return
+
+        positions, velocities, masses = self.get_body_arrays(objects)
+        external_accelerations = [
+            obj.physics.acceleration.to_tuple() for obj in objects
+        ]
+        external_accelerations = np.array(external_accelerations).reshape(-1, 3)
+        get_accelerations = partial(
+            self.get_awake_accelerations,
+            positions=positions,
+            awake=awake,
+            masses=masses,
+            external_accelerations=external_accelerations,
+        )
 
-        self.draw_call.draw()
+        if awake.any():
+            awake_positions, awake_velocities = self.integrator.step(
+                positions[awake], velocities[awake], timestep, get_accelerations
+            )
+            velocities[awake] = awake_velocities
+            awake_objects = [obj for obj, is_awake in zip(objects, awake) if is_awake]
+            for obj, position, velocity in zip(
+                awake_objects, awake_positions.tolist(), awake_velocities.tolist()
+            ):
+                obj.physics.set_state(Vector3D(*position), Vector3D(*velocity))
+        else:
+            # Only gravity can wake a sleeping body here, it is still evaluated.
+            get_accelerations(positions[awake])
+
+        self.sleep_system.update(objects, awake, velocities, self.body_accelerations)
+
+    def step_physics(self, timestep: float):
+        if self.enable_gravity:
+            positions, _, masses = self.get_body_arrays(self.draw_call.objects)
+            self.apply_particle_gravity(positions, masses)
+
+        if self.draw_call.objects:
+            self.step_bodies(timestep)
+
+        for particle_system in self.draw_call.particle_systems:
+            particle_system.update(timestep)
+
+    def compute_physics(self, frame_time: float):
+        substeps = self.fixed_timestep.advance(frame_time)
+        timestep = self.fixed_timestep.timestep
+
+        for _ in range(substeps):
+            self.step_physics(timestep)
+        if substeps:
+            self.update_energy()
+        self.draw_call.interpolation_alpha = self.fixed_timestep.alpha
+
+    def compute_all_objects(self, frame_time: float):
+        profiler = self.draw_call.profiler
+
+        with profiler.stage("physics"):
+            if self.physics_worker:
+                snapshot = self.physics_worker.exchange(frame_time)
+                self.draw_call.physics_snapshot = snapshot
+                if snapshot.worker_time:
+                    profiler.record("physics_worker", snapshot.worker_time)
+            else:
+                self.compute_physics(frame_time)
+
+        with profiler.stage("draw"):
+            self.draw_call.draw()
 
     def write_fps_text(self, frametime: FrameTime):
         header_font = self.get_header_font()
@@ -132,18 +352,42 @@ class Simulation:
         text_average = f"Average: {frametime.average_fps:.2f} FPS"
 
         self.text_writer.add_text_top_left(header_text, header_font)
-        self.text_writer.add_text_top_left(text_average)
+        self.text_writer.add_text_top_left(text_average, update_hz=self.hud_update_hz)
+
+        quality = self.draw_call.quality.name
+        if self.quality_scaler:
+            target = self.quality_scaler.target_frame_time * 1000.0
+            quality_text = f"Quality:  {quality}  (target {target:.1f} ms)"
+        else:
+            quality_text = f"Quality:  {quality}  (fixed)"
+        self.text_writer.add_text_top_left(quality_text)
 
     def write_timestep_text(self):
         khz = self.timestep_hz / 1000.0
+        substeps = self.fixed_timestep.substeps
+        dropped = self.fixed_timestep.dropped_time
         text = f"Timestep:  {khz} khz"
+        substeps_text = f"Substeps:  {substeps}  (dropped {dropped:.2f}s)"
+        integrator = self.integrator.name
+        drift = self.energy_monitor.drift
+        integrator_text = f"Integrator:  {integrator}  (energy drift {drift:+.2e})"
         self.text_writer.add_text_top_left(text)
+        self.text_writer.add_text_top_left(substeps_text, update_hz=self.hud_update_hz)
+        self.text_writer.add_text_top_left(
+            integrator_text, update_hz=self.hud_update_hz
+        )
 
     def write_object_count(self):
         object_count = len(self.draw_call.objects)
-        text = f"Objects:  {object_count}"
+        sleeping_count = self.sleep_system.get_sleeping_count(self.draw_call.objects)
+        text = f"Objects:  {object_count}  (sleeping {sleeping_count})"
         self.text_writer.add_text_top_left(text)
 
+        if self.draw_call.particle_systems:
+            particle_count = self.draw_call.get_particle_count()
+            particle_text = f"Particles:  {particle_count}"
+            self.text_writer.add_text_top_left(particle_text)
+
     def write_camera_information(self):
         camera = self.draw_call.camera
         cp = camera.camera_position
@@ -179,14 +423,38 @@ class Simulation:
         self.text_writer.add_text_top_left(up_dir)
         self.text_writer.add_text_top_left(side_dir)
 
+    def write_profiler_information(self, frametime: FrameTime):
+        if not frametime.stage_times:
+            return
+
+        header_font = self.get_header_font()
+        info_header = "Frame Profiler (p50 / p95 / p99 ms)"
+
+        self.text_writer.add_text_top_left("")
+        self.text_writer.add_text_top_left(info_header, header_font)
+        for stage_time in frametime.stage_times:
+            indent = "    " * stage_time.depth
+            stage_name = stage_time.name.rsplit("/", 1)[-1]
+            p50 = f"{stage_time.p50:.2f}"
+            p95 = f"{stage_time.p95:.2f}"
+            p99 = f"{stage_time.p99:.2f}"
+            text = f"{indent}{stage_name}:  {p50} / {p95} / {p99}"
+            self.text_writer.add_text_top_left(
+                text, update_hz=self.hud_update_hz, label=stage_time.name
+            )
+
     def draw_text(self, graphics: GraphicsABC):
         self.text_writer.draw(graphics)
 
     def simulate(self, graphics: GraphicsABC, frametime: FrameTime):
-        self.compute_all_objects()
+        profiler = self.draw_call.profiler
+
+        self.compute_all_objects(frametime.frame_time)
 
-        self.write_fps_text(frametime)
-        self.write_timestep_text()
-        self.write_object_count()
-        self.write_camera_information()
-        self.draw_text(graphics)
+        with profiler.stage("hud"):
+            self.write_fps_text(frametime)
+            self.write_timestep_text()
+            self.write_object_count()
+            self.write_camera_information()
+            self.write_profiler_information(frametime)
+            self.draw_text(graphics)
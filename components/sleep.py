@@ -0,0 +1,103 @@
+import numpy as np
+
+from abstracts.body_abc import Body
+
+
+class SleepSystem:
+    """Puts resting bodies to sleep so the physics step can skip them.
+
+    A body whose speed and acceleration stay below the thresholds for
+    `steps_to_sleep` consecutive steps is stopped and left out of the
+    integration, while gravity is enabled it still attracts the awake
+    bodies. A sleeping body wakes when its acceleration rises over the
+    threshold, when Physics.set_* moves it, or when the bounding box of an
+    awake body touches its own. Waking spreads through touching sleeping
+    bodies, so a resting island wakes as a whole."""
+
+    def __init__(
+        self,
+        speed_threshold: float = 1.0,
+        acceleration_threshold: float = 1.0,
+        steps_to_sleep: int = 60,
+    ):
+        self.speed_threshold = speed_threshold
+        self.acceleration_threshold = acceleration_threshold
+        self.steps_to_sleep = steps_to_sleep
+        self.enabled = True
+
+    @staticmethod
+    def get_sleeping_count(bodies: list[Body]) -> int:
+        return sum(1 for body in bodies if body.physics.is_sleeping)
+
+    @staticmethod
+    def get_awake_mask(bodies: list[Body]) -> np.ndarray:
+        awake = [not body.physics.is_sleeping for body in bodies]
+        return np.array(awake, dtype=bool)
+
+    @staticmethod
+    def get_bounding_boxes(bodies: list[Body]) -> np.ndarray:
+        """(N, 6) array of min and max corners, from the local bounds taken
+        at setup and the current physics positions."""
+        local_bounds = [body.physics.local_bounds for body in bodies]
+        positions = [body.physics.position.to_tuple() for body in bodies]
+        local_bounds = np.array(local_bounds, dtype=np.float64).reshape(-1, 6)
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        return local_bounds + np.tile(positions, 2)
+
+    def wake_all(self, bodies: list[Body]) -> None:
+        for body in bodies:
+            body.physics.wake()
+
+    def wake_touched(self, bodies: list[Body]) -> np.ndarray:
+        """Wakes the sleeping bodies whose bounding boxes touch awake ones,
+        returns the mask of awake bodies afterwards."""
+        awake = self.get_awake_mask(bodies)
+        if awake.all() or not awake.any():
+            return awake
+
+        boxes = self.get_bounding_boxes(bodies)
+        touching = awake.copy()
+        while True:
+            sleeping = np.flatnonzero(~awake)
+            sleeping_boxes = boxes[sleeping, np.newaxis, :]
+            touching_boxes = boxes[np.newaxis, touching, :]
+            overlaps = (sleeping_boxes[..., 0:3] <= touching_boxes[..., 3:6]) & (
+                sleeping_boxes[..., 3:6] >= touching_boxes[..., 0:3]
+            )
+            woken = sleeping[overlaps.all(axis=2).any(axis=1)]
+            if not len(woken):
+                return awake
+
+            for index in woken.tolist():
+                bodies[index].physics.wake()
+            awake[woken] = True
+            touching = np.zeros_like(awake)
+            touching[woken] = True
+
+    def update(
+        self,
+        bodies: list[Body],
+        awake: np.ndarray,
+        velocities: np.ndarray,
+        accelerations: np.ndarray,
+    ) -> None:
+        """Counts resting steps with the velocities and accelerations of all
+        bodies after a step, waking or putting bodies to sleep."""
+        if not self.enabled:
+            return
+
+        speeds_sq = np.einsum("ij,ij->i", velocities, velocities)
+        accelerations_sq = np.einsum("ij,ij->i", accelerations, accelerations)
+        accelerating = accelerations_sq > self.acceleration_threshold**2
+        resting = (speeds_sq <= self.speed_threshold**2) & ~accelerating
+
+        for index in np.flatnonzero(awake | accelerating).tolist():
+            physics = bodies[index].physics
+            if physics.is_sleeping:
+                physics.wake()
+            elif not resting[index]:
+                physics.rest_steps = 0
+            else:
+                physics.rest_steps += 1
+                if physics.rest_steps >= self.steps_to_sleep:
+                    physics.sleep()
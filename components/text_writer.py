@@ -1,27 +1,66 @@
+import time
+
 from abstracts.graphics_abc import GraphicsABC
 from components.font import FontSettings
+from shared_dcs import OverlayLine
 
 from typing import Optional
 
 
 class TextWriter:
+    """Collects the HUD lines of a frame and hands them to the graphics
+    overlay, which only renders the lines that changed.
+
+    A line added with `update_hz` keeps showing its previous text until
+    1 / update_hz seconds have passed since that text was shown, so fast
+    changing values like the FPS stop dirtying the overlay every frame.
+    Shown texts are kept per line label, the text before the first ':'
+    unless one is given, so inserting a line does not shift them."""
+
     def __init__(self, font_settings: FontSettings):
         self.font_settings = font_settings
         self.tl_column: list[tuple[str, Optional[FontSettings]]] = []
+        self.shown_texts: dict[str, tuple[str, float]] = {}
 
-    def add_text_top_left(self, text: str, font: Optional[FontSettings] = None):
+    def add_text_top_left(
+        self,
+        text: str,
+        font: Optional[FontSettings] = None,
+        update_hz: Optional[float] = None,
+        label: Optional[str] = None,
+    ):
+        if update_hz:
+            if label is None:
+                label = text.partition(":")[0]
+            text = self.get_rate_limited_text(label, text, update_hz)
         self.tl_column.append((text, font))
 
-    def draw(self, graphics: GraphicsABC):
-        width = graphics.get_width()
-        height = graphics.get_height()
+    def get_rate_limited_text(self, label: str, text: str, update_hz: float) -> str:
+        now = time.perf_counter()
+        shown = self.shown_texts.get(label)
+        if shown:
+            shown_text, shown_time = shown
+            if shown_text == text or now - shown_time < 1.0 / update_hz:
+                return shown_text
 
+        self.shown_texts[label] = (text, now)
+        return text
+
+    def get_overlay_lines(self, width: int, height: int) -> list[OverlayLine]:
+        lines = []
         for idx, (text, font_settings) in enumerate(self.tl_column, 1):
             if not font_settings:
                 font_settings = self.font_settings
             text_xy = self.get_text_xy(font_settings, width, height, idx)
-            graphics.draw_text(text_xy, text, font_settings)
+            lines.append(OverlayLine(text, text_xy, font_settings))
+        return lines
+
+    def draw(self, graphics: GraphicsABC):
+        width = graphics.get_width()
+        height = graphics.get_height()
 
+        lines = self.get_overlay_lines(width, height)
+        graphics.draw_overlay(lines)
         self.tl_column = []
 
     @staticmethod
@@ -0,0 +1,37 @@
+class FixedTimestep:
+    """Accumulator scheduler that turns variable frame times into a whole
+    number of fixed physics steps.
+
+    The number of steps per frame is capped at `max_substeps`. Time beyond
+    the cap is dropped instead of carried over, so a slow frame cannot
+    snowball into ever more physics work (the spiral of death)."""
+
+    def __init__(self, timestep: float, max_substeps: int = 8):
+        self.timestep = timestep
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.substeps = 0
+        self.dropped_time = 0.0
+
+    def set_timestep(self, timestep: float) -> None:
+        self.timestep = timestep
+        self.accumulator = min(self.accumulator, timestep)
+
+    def advance(self, frame_time: float) -> int:
+        "Adds the elapsed frame time and returns the number of steps to run."
+        self.accumulator += frame_time
+        substeps = int(self.accumulator // self.timestep)
+        self.accumulator -= substeps * self.timestep
+
+        if substeps > self.max_substeps:
+            dropped_steps = substeps - self.max_substeps
+            self.dropped_time += dropped_steps * self.timestep
+            substeps = self.max_substeps
+
+        self.substeps = substeps
+        return substeps
+
+    @property
+    def alpha(self) -> float:
+        "Fraction of a step left in the accumulator, used for interpolation."
+        return min(self.accumulator / self.timestep, 1.0)
@@ -0,0 +1,70 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+
+from pathlib import Path
+from typing import Optional
+
+
+class ChromeTracer:
+    """Records timed events into a ring buffer and writes them in the
+    Chrome Trace Event format (chrome://tracing, Perfetto, Speedscope).
+
+    Events are stored as complete ("X") events, each holding its begin
+    time and duration, so a buffer that wrapped around never contains an
+    end without its begin."""
+
+    def __init__(self, capacity: int = 200_000):
+        self.enabled = False
+        self.capacity = capacity
+        self.events: deque[tuple[str, str, float, float, int]] = deque(maxlen=capacity)
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        print("TRACING:", self.enabled)
+
+    def clear(self) -> None:
+        self.events.clear()
+
+    def add_event(
+        self, name: str, category: str, start: float, duration: float
+    ) -> None:
+        thread_id = threading.get_ident()
+        self.events.append((name, category, start, duration, thread_id))
+
+    def get_trace_events(self) -> list[dict]:
+        origin = self.origin
+        pid = self.pid
+        trace_events = []
+
+        for name, category, start, duration, thread_id in list(self.events):
+            trace_event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - origin) * 1_000_000.0,
+                "dur": duration * 1_000_000.0,
+                "pid": pid,
+                "tid": thread_id,
+            }
+            trace_events.append(trace_event)
+        return trace_events
+
+    def dump(self, file_path: Optional[Path] = None) -> Path:
+        if file_path is None:
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            file_path = Path(f"./trace-{timestamp}.json")
+
+        trace = {
+            "traceEvents": self.get_trace_events(),
+            "displayTimeUnit": "ms",
+        }
+        with open(file_path, "w") as f:
+            json.dump(trace, f)
+
+        print(f"TRACE WRITTEN: {file_path} ({len(self.events)} events)")
+        return file_path
@@ -4,8 +4,12 @@ from components.shape import Shape
 from components.color import RGBA
 
 from components.vertices import Sphere, Cube, GridHorizontal, MeshConverter
+from components.vertices import ParticleCircle
+from components.particles import ParticleSystem
 from components.model import OBJModelFormat
 from components.light import Light
+from components.assets import asset_registry
+from components.lod import LODGenerator
 
 from pathlib import Path
 
@@ -33,6 +37,7 @@ def get_sphere1():
     sphere = Sphere(100, 10, 10)
     sphere.set_offset(*position)
     mesh = sphere.get_triangle_mesh()
+    mesh = LODGenerator().generate(mesh)
     mesh.light = light
     body = Shape(mesh)
     body.physics.set_mass(mass)
@@ -48,6 +53,7 @@ def get_sphere2():
     sphere = Sphere(100, 10, 10)
     sphere.set_offset(*position)
     mesh = sphere.get_triangle_mesh()
+    mesh = LODGenerator().generate(mesh)
     mesh.light = light
     body = Shape(mesh)
     body.physics.set_mass(mass)
@@ -56,7 +62,6 @@ def get_sphere2():
     return body
 
 
-
 def get_sphere3():
     position = (-5000.0, -1100.0, -3100.0)
     mass = 500_000_000
@@ -64,6 +69,7 @@ def get_sphere3():
     sphere = Sphere(100, 10, 10)
     sphere.set_offset(*position)
     mesh = sphere.get_triangle_mesh()
+    mesh = LODGenerator().generate(mesh)
     mesh.light = light
     body = Shape(mesh)
     body.physics.set_mass(mass)
@@ -72,10 +78,6 @@ def get_sphere3():
     return body
 
 
-
-
-
-
 def get_cube_t1():
     px = random.uniform(-50, -40)
     py = random.uniform(-50, -40)
@@ -124,12 +126,11 @@ def get_obj_from_file(file_path: Path):
 def get_obj():
     mass = 100_000_000_000
     file_path = Path("./cottage2.obj")
-    obj = OBJModelFormat(file_path, 0.2)
-    obj.set_offset(500, -100, 600)
-    polygons = obj.get_polygons()
+    position = (500.0, -100.0, 600.0)
     color = RGBA(0.8, 0.3, 0.3, 1.0)
+    mesh = asset_registry.get_obj_instance(file_path, 0.2, position, color)
 
-    body = Shape(polygons)
+    body = Shape(mesh)
     body.set_color(color)
     body.physics.set_mass(mass)
     return body
@@ -140,10 +141,8 @@ def get_obj2():
     mass = 50_000
 
     file_path = Path("./cottage2.obj")
-    obj = OBJModelFormat(file_path, 0.2)
-    obj.set_offset(*position)
-    mesh = obj.get_polygons()
     color = RGBA(0.8, 0.3, 0.3, 1.0)
+    mesh = asset_registry.get_obj_instance(file_path, 0.2, position, color)
 
     body = Shape(mesh)
     body.set_color(color)
@@ -151,3 +150,12 @@ def get_obj2():
     body.physics.set_mass(mass)
     body.physics.set_velocity(1000, 0, 0)
     return body
+
+
+def get_particle_disk():
+    position = (400.0, 1100.0, 3100.0)
+    color = RGBA(0.9, 0.8, 0.5, 1.0)
+    particle_circle = ParticleCircle(300)
+    particles = ParticleSystem.from_particle_circle(particle_circle, *position, color)
+    particles.set_orbital_velocity(position, 150.0)
+    return particles
@@ -1,30 +1,206 @@
+import time
+import argparse
 from functools import partial
 
 from abstracts.graphics_abc import GraphicsABC
-from components.graphics import TurtleGraphics, PygGraphics
+from components.graphics import (
+    TurtleGraphics,
+    PygGraphics,
+    PygHeadlessGraphics,
+    TkGraphics,
+)
 from components.simulation import Simulation
 from components.camera import Camera
 from components.color import RGBA
 from components.frametime import FrameTimeHandler
 from components.draw_call import DrawCall
+from components.profiler import FrameProfiler
+from components.integrators import INTEGRATORS
+from components.quality import RenderScaler
+from components.capture import (
+    FrameCapture,
+    CAPTURE_FORMATS,
+    CAPTURE_POLICIES,
+    CAPTURE_WRITERS,
+)
+
+from pathlib import Path
+from typing import Optional
+
+
+def parse_render_scale(value: str) -> Optional[float]:
+    "A scale in (0, 1], or None for 'auto'."
+    if value == "auto":
+        return None
+
+    scale = float(value)
+    if not 0.0 < scale <= 1.0:
+        raise argparse.ArgumentTypeError("render scale must be in (0, 1]")
+    return scale
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Physics System")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="render to an offscreen surface without opening a window",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["pygame", "tk"],
+        default="pygame",
+        help="window backend, tk draws on a canvas with pooled items",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=None, help="stop after this many frames"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=None, help="stop after this many seconds"
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="experimental: step physics on a worker thread while the previous "
+        "step is rendered, slower than serial on a single core",
+    )
+    parser.add_argument(
+        "--integrator",
+        choices=list(INTEGRATORS),
+        default="verlet",
+        help="integrator used to step the bodies, cycle at runtime with 'i'",
+    )
+    parser.add_argument(
+        "--mesh-workers",
+        type=int,
+        default=0,
+        help="run the per-mesh render stages on this many processes",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="clear and present only the screen areas drawn in the last two frames",
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=["capped", "uncapped", "adaptive"],
+        default="capped",
+        help="cap the frame rate at --fps, run uncapped, or cap it and scale the "
+        "render quality to hold --fps",
+    )
+    parser.add_argument(
+        "--fps", type=int, default=60, help="frame rate cap and quality target"
+    )
+    parser.add_argument(
+        "--render-scale",
+        type=parse_render_scale,
+        default=1.0,
+        help="rasterize the scene at this fraction of the window size and upscale "
+        "it, 'auto' adjusts it to hold --fps",
+    )
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        default=None,
+        help="record frames into this directory, pause and resume with 'c'",
+    )
+    parser.add_argument(
+        "--capture-format",
+        choices=CAPTURE_FORMATS,
+        default="png",
+        help="numbered PNG files or one raw rgb24 video stream",
+    )
+    parser.add_argument(
+        "--capture-policy",
+        choices=CAPTURE_POLICIES,
+        default="drop",
+        help="drop frames or block the render loop when the writer falls behind",
+    )
+    parser.add_argument(
+        "--capture-writer",
+        choices=CAPTURE_WRITERS,
+        default="process",
+        help="save the frames on a thread or a separate process",
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="enable the per-stage frame profiler"
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="record a Chrome trace, written on exit or with the 'y' key",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
+    arguments = parse_arguments()
     width = 1760
     height = 960
     background_color = RGBA(0.15, 0.15, 0.15, 1.0)
 
-    graphics = PygGraphics(width, height)
+    if arguments.headless:
+        graphics = PygHeadlessGraphics(width, height)
+    elif arguments.backend == "tk":
+        graphics = TkGraphics(width, height)
+    else:
+        graphics = PygGraphics(width, height)
+    render_scaler = None
+    if isinstance(graphics, PygGraphics):
+        graphics.set_dirty_rects(arguments.dirty_rects)
+        if arguments.render_scale is None:
+            render_scaler = RenderScaler(1.0 / arguments.fps)
+        else:
+            graphics.set_render_scale(arguments.render_scale)
+    if arguments.pacing == "uncapped":
+        graphics.set_frame_cap(None)
+    else:
+        graphics.set_frame_cap(arguments.fps)
     camera = Camera(width, height)
-    draw_call = DrawCall(graphics, camera)
-    frame_timing = FrameTimeHandler(10)
+    profiler = FrameProfiler()
+    profiler.enabled = arguments.profile
+    profiler.tracer.enabled = arguments.trace
+    draw_call = DrawCall(graphics, camera, profiler)
+    draw_call.set_mesh_workers(arguments.mesh_workers)
+    frame_timing = FrameTimeHandler(10, profiler)
 
     graphics.set_title("Physics System")
     graphics.set_background_color(background_color)
 
     simulation = Simulation(draw_call)
     simulation.setup_objects()
-    GraphicsHandler(graphics, simulation, camera, frame_timing)
+    simulation.set_integrator(arguments.integrator)
+    simulation.set_pipelined(arguments.pipelined)
+    if arguments.pacing == "adaptive":
+        simulation.set_target_frame_time(1.0 / arguments.fps)
+
+    frame_capture = None
+    if arguments.capture and not isinstance(graphics, PygGraphics):
+        print("WARNING: FRAME CAPTURE NEEDS THE PYGAME BACKEND.")
+    elif arguments.capture:
+        frame_capture = FrameCapture(
+            arguments.capture,
+            (width, height),
+            image_format=arguments.capture_format,
+            policy=arguments.capture_policy,
+            writer=arguments.capture_writer,
+        )
+    try:
+        GraphicsHandler(
+            graphics,
+            simulation,
+            camera,
+            frame_timing,
+            frame_limit=arguments.frames,
+            time_limit=arguments.seconds,
+            frame_capture=frame_capture,
+            render_scaler=render_scaler,
+        )
+    finally:
+        simulation.set_pipelined(False)
+        draw_call.set_mesh_workers(0)
+        if frame_capture:
+            frame_capture.close()
 
 
 class GraphicsHandler:
@@ -34,11 +210,19 @@ class GraphicsHandler:
         simulation: Simulation,
         camera: Camera,
         frame_timing: FrameTimeHandler,
+        frame_limit: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        frame_capture: Optional[FrameCapture] = None,
+        render_scaler: Optional[RenderScaler] = None,
     ):
         self.graphics = graphics
         self.simulation = simulation
         self.camera = camera
         self.frame_timing = frame_timing
+        self.frame_limit = frame_limit
+        self.time_limit = time_limit
+        self.frame_capture = frame_capture
+        self.render_scaler = render_scaler
         self.previous_pointer = graphics.get_pointer_xy()
         self.register_keys()
         self.draw_loop()
@@ -67,6 +251,14 @@ class GraphicsHandler:
         move_down = partial(camera.increment_position_y, step_val)
 
         toggle_frustum = partial(camera.toggle_frustum_clipping)
+        toggle_gravity = partial(simulation.toggle_gravity)
+        toggle_pipelined = partial(simulation.toggle_pipelined)
+        cycle_integrator = partial(simulation.cycle_integrator)
+        toggle_sleeping = partial(simulation.toggle_sleeping)
+        profiler = simulation.draw_call.profiler
+        toggle_profiler = partial(profiler.toggle)
+        toggle_tracing = partial(profiler.tracer.toggle)
+        dump_trace = partial(profiler.tracer.dump)
 
         reset = partial(camera.reset)
 
@@ -78,8 +270,18 @@ class GraphicsHandler:
         self.graphics.register_onkeypress(move_up, "Up")
         self.graphics.register_onkeypress(move_down, "Down")
         self.graphics.register_onkeypress(toggle_frustum, "o", False)
+        self.graphics.register_onkeypress(toggle_gravity, "g", False)
+        self.graphics.register_onkeypress(toggle_pipelined, "m", False)
+        self.graphics.register_onkeypress(cycle_integrator, "i", False)
+        self.graphics.register_onkeypress(toggle_sleeping, "z", False)
+        self.graphics.register_onkeypress(toggle_profiler, "p", False)
+        self.graphics.register_onkeypress(toggle_tracing, "t", False)
+        self.graphics.register_onkeypress(dump_trace, "y", False)
 
         self.graphics.register_onkeypress(reset, "r", False)
+        if self.frame_capture:
+            toggle_capture = partial(self.frame_capture.toggle)
+            self.graphics.register_onkeypress(toggle_capture, "c", False)
         self.graphics.register_onkeypress(increase_distance, "e")
         self.graphics.register_onkeypress(decrease_distance, "q")
         self.graphics.register_onkeypress(increase_timestep, ".")
@@ -99,25 +301,63 @@ class GraphicsHandler:
         pass
 
     def on_mouse_move(self) -> None:
-        px, py = self.previous_pointer
-        nx, ny = self.graphics.get_pointer_xy()
-
-        if px != nx or py != ny:
-            dx, dy = self.graphics.get_pointer_xy()
-            camera = self.camera
-            camera.handle_mouse_movement(dx, dy)
+        pointer = self.graphics.get_pointer_xy()
+        if pointer != self.previous_pointer:
+            self.previous_pointer = pointer
+            self.camera.handle_mouse_movement(*pointer)
 
     def on_draw(self) -> None:
+        profiler = self.simulation.draw_call.profiler
         frametime = self.frame_timing.get_frametime_data()
-        self.graphics.clear_screen()
+        frame_start = time.perf_counter()
+
+        with profiler.stage("clear_screen"):
+            self.graphics.clear_screen()
         self.simulation.simulate(self.graphics, frametime)
+        # The quality scaler is fed the frame without the wait for the cap.
+        busy_time = time.perf_counter() - frame_start
+        self.simulation.update_quality(busy_time)
+        self.update_render_scale(busy_time)
+        if self.frame_capture:
+            with profiler.stage("capture"):
+                self.frame_capture.capture(self.graphics.get_frame_bytes())
+        with profiler.stage("present"):
+            self.graphics.update()
         self.frame_timing.tick()
-        self.graphics.update()
+
+    def update_render_scale(self, busy_time: float) -> None:
+        scaler = self.render_scaler
+        if scaler and scaler.update(busy_time):
+            self.graphics.set_render_scale(scaler.scale)
+            print("RENDER SCALE:", scaler.scale)
+
+    def is_running(self, frame: int, elapsed: float) -> bool:
+        if self.frame_limit is not None and frame >= self.frame_limit:
+            return False
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return False
+        return True
+
+    def print_summary(self, frame: int, elapsed: float) -> None:
+        average_fps = frame / elapsed if elapsed else 0.0
+        print(f"FRAMES: {frame}  ELAPSED: {elapsed:.2f}s  FPS: {average_fps:.2f}")
 
     def draw_loop(self) -> None:
-        while True:
+        frame = 0
+        start_time = time.perf_counter()
+        elapsed = 0.0
+
+        while self.is_running(frame, elapsed):
             self.handle_events()
             self.on_draw()
+            frame += 1
+            elapsed = time.perf_counter() - start_time
+
+        self.print_summary(frame, elapsed)
+
+        tracer = self.simulation.draw_call.profiler.tracer
+        if tracer.enabled:
+            tracer.dump()
 
 
 if __name__ == "__main__":
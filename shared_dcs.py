@@ -1,5 +1,8 @@
+import numpy as np
+
 from components.vectors import Vector3D
 from components.color import RGBA
+from components.font import FontSettings
 
 from dataclasses import dataclass
 from typing import Optional, Union, Callable
@@ -42,13 +45,57 @@ class Circle:
 @dataclass
 class KeyRegister:
     key: str
-    scancode: int
+    scancode: Union[int, str]
     function: Callable
     press_time: float
     is_pressed: bool
     is_repeatable: bool
 
 
+@dataclass(frozen=True)
+class PhysicsSnapshot:
+    positions: tuple[Vector3D, ...]
+    previous_positions: tuple[Vector3D, ...]
+    alpha: float
+    worker_time: float = 0.0
+    particle_positions: tuple[np.ndarray, ...] = ()
+    previous_particle_positions: tuple[np.ndarray, ...] = ()
+
+    def get_render_positions(self) -> list[Vector3D]:
+        alpha = self.alpha
+        render_positions = []
+        for previous, position in zip(self.previous_positions, self.positions):
+            render_position = previous.lerp_interpolation(position, alpha)
+            render_positions.append(render_position)
+        return render_positions
+
+
+@dataclass
+class StageTime:
+    name: str
+    depth: int
+    p50: float
+    p95: float
+    p99: float
+
+
 @dataclass
 class FrameTime:
     average_fps: float
+    frame_time: float
+    stage_times: list[StageTime]
+
+
+@dataclass(frozen=True)
+class OverlayLine:
+    text: str
+    point: tuple[float, float]
+    font_settings: FontSettings
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name: str
+    max_error_px: float
+    far_plane: float
+    lighting_interval: int